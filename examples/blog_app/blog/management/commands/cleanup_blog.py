@@ -14,4 +14,4 @@ class Command(BaseCommand):
     help = "Clean up all database tables for a fresh start"
 
     def handle(self, *args, **options):
-        clean_database(self.stdout, app_prefix='blog')
\ No newline at end of file
+        clean_database(self.stdout)
\ No newline at end of file
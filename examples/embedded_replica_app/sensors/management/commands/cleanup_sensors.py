@@ -17,7 +17,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         # Clean the remote database
-        clean_database(self.stdout, app_prefix='sensors')
+        clean_database(self.stdout)
         
         # If using embedded replica mode, also remove the local database file
         # Check if SYNC_URL is configured in settings (indicates embedded replica mode)
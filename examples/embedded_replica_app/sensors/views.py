@@ -30,7 +30,9 @@ def index(request):
     
     # Get additional stats
     total_readings = SensorReading.objects.count()
-    unique_sensors = SensorReading.objects.values('sensor_id').distinct().count()
+    unique_sensors = SensorReading.objects.aggregate(
+        count=Count('sensor_id', distinct=True)
+    )['count']
     aggregated_count = AggregatedData.objects.count()
     
     context = {
@@ -9,6 +9,7 @@ from .models import (
     RealtimeVisitor,
     HourlyStats,
     DailyStats,
+    PeriodStats,
 )
 
 
@@ -97,3 +98,19 @@ class DailyStatsAdmin(admin.ModelAdmin):
     list_filter = ["website", "date"]
     date_hierarchy = "date"
     readonly_fields = ["created_at", "updated_at"]
+
+
+@admin.register(PeriodStats)
+class PeriodStatsAdmin(admin.ModelAdmin):
+    list_display = [
+        "website",
+        "period",
+        "start_date",
+        "end_date",
+        "pageviews",
+        "visitors",
+        "updated_at",
+    ]
+    list_filter = ["website", "period", "end_date"]
+    date_hierarchy = "end_date"
+    readonly_fields = ["created_at", "updated_at"]
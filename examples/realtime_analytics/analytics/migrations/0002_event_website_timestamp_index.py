@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["website", "-timestamp"], name="analytics_e_website_bfca1c_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0002_event_website_timestamp_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PeriodStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[
+                            ("week", "Week"),
+                            ("month", "Month"),
+                            ("year", "Year"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("start_date", models.DateField()),
+                ("end_date", models.DateField(db_index=True)),
+                ("pageviews", models.IntegerField(default=0)),
+                ("visitors", models.IntegerField(default=0)),
+                ("sessions", models.IntegerField(default=0)),
+                ("events", models.IntegerField(default=0)),
+                ("bounce_rate_total", models.FloatField(default=0)),
+                ("bounce_rate_days", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "website",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="period_stats",
+                        to="analytics.website",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-end_date"],
+                "unique_together": {("website", "period", "end_date")},
+            },
+        ),
+    ]
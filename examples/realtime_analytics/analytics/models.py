@@ -100,6 +100,7 @@ class Event(models.Model):
         ordering = ["-timestamp"]
         indexes = [
             models.Index(fields=["website", "event_type", "-timestamp"]),
+            models.Index(fields=["website", "-timestamp"]),
             models.Index(fields=["session_id", "-timestamp"]),
         ]
 
@@ -258,3 +259,123 @@ class DailyStats(models.Model):
 
     def __str__(self):
         return f"{self.website.name} - {self.date}"
+
+
+class PeriodStats(models.Model):
+    """DailyStats rolled up over a week/month/year window ending on a date."""
+
+    PERIOD_DAYS = {"week": 7, "month": 30, "year": 365}
+    PERIODS = [
+        ("week", "Week"),
+        ("month", "Month"),
+        ("year", "Year"),
+    ]
+
+    website = models.ForeignKey(
+        Website, on_delete=models.CASCADE, related_name="period_stats"
+    )
+    period = models.CharField(max_length=10, choices=PERIODS)
+    start_date = models.DateField()
+    end_date = models.DateField(db_index=True)
+
+    # Metrics (sums of DailyStats over start_date..end_date)
+    pageviews = models.IntegerField(default=0)
+    visitors = models.IntegerField(default=0)
+    sessions = models.IntegerField(default=0)
+    events = models.IntegerField(default=0)
+
+    # Daily bounce rates are averaged, so keep their sum and count
+    bounce_rate_total = models.FloatField(default=0)
+    bounce_rate_days = models.IntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [["website", "period", "end_date"]]
+        ordering = ["-end_date"]
+
+    def __str__(self):
+        return f"{self.website.name} - {self.period} ending {self.end_date}"
+
+    @property
+    def bounce_rate(self):
+        """Average of the daily bounce rates in the window."""
+        if not self.bounce_rate_days:
+            return None
+        return self.bounce_rate_total / self.bounce_rate_days
+
+    @classmethod
+    def get_for(cls, website, period, end_date):
+        """
+        Return the roll-up for a window ending on ``end_date``.
+
+        Only finished windows are stored, built from DailyStats once. Today's
+        and yesterday's DailyStats still change (yesterday's last hour is
+        finalized after midnight), so a window including them is summed on
+        every call and returned unsaved; a stored copy could miss a tracker
+        update committed between the sum and the insert.
+        """
+        start_date = end_date - timedelta(days=cls.PERIOD_DAYS[period])
+        if end_date >= timezone.now().date() - timedelta(days=1):
+            return cls(
+                website=website,
+                period=period,
+                start_date=start_date,
+                end_date=end_date,
+                **cls._sum_daily_stats(website, start_date, end_date),
+            )
+
+        stats = cls.objects.filter(
+            website=website, period=period, end_date=end_date
+        ).first()
+        if stats is not None:
+            return stats
+
+        stats, _ = cls.objects.get_or_create(
+            website=website,
+            period=period,
+            end_date=end_date,
+            defaults={
+                "start_date": start_date,
+                **cls._sum_daily_stats(website, start_date, end_date),
+            },
+        )
+        return stats
+
+    @staticmethod
+    def _sum_daily_stats(website, start_date, end_date):
+        """Return the PeriodStats metrics for start_date..end_date."""
+        totals = DailyStats.objects.filter(
+            website=website, date__gte=start_date, date__lte=end_date
+        ).aggregate(
+            pageviews=models.Sum("pageviews"),
+            visitors=models.Sum("unique_visitors"),
+            sessions=models.Sum("sessions"),
+            events=models.Sum("events"),
+            bounce_rate_total=models.Sum("bounce_rate"),
+            bounce_rate_days=models.Count("bounce_rate"),
+        )
+        return {name: value or 0 for name, value in totals.items()}
+
+        start_date = end_date - timedelta(days=cls.PERIOD_DAYS[period])
+        totals = DailyStats.objects.filter(
+            website=website, date__gte=start_date, date__lte=end_date
+        ).aggregate(
+            pageviews=models.Sum("pageviews"),
+            visitors=models.Sum("unique_visitors"),
+            sessions=models.Sum("sessions"),
+            events=models.Sum("events"),
+            bounce_rate_total=models.Sum("bounce_rate"),
+            bounce_rate_days=models.Count("bounce_rate"),
+        )
+        stats, _ = cls.objects.get_or_create(
+            website=website,
+            period=period,
+            end_date=end_date,
+            defaults={
+                "start_date": start_date,
+                **{name: value or 0 for name, value in totals.items()},
+            },
+        )
+        return stats
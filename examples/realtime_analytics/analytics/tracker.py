@@ -1,14 +1,34 @@
 """Real-time event tracking with Turso sync."""
 
+import json
 import threading
 import time
 from datetime import datetime, timedelta
-from collections import defaultdict
-from typing import Dict, List, Any
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from typing import Dict, List, Any, Tuple
 
-from django.db import connections, transaction
+from django.conf import settings
+from django.db import connection, connections, transaction
 from django.utils import timezone
-from django.db.models import Count, Avg, Sum, Q, F
+from django.db.models import (
+    Count,
+    Avg,
+    Sum,
+    Q,
+    F,
+    Case,
+    DateTimeField,
+    FloatField,
+    Func,
+    IntegerField,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from .models import (
     Website,
@@ -18,7 +38,191 @@ from .models import (
     RealtimeVisitor,
     HourlyStats,
     DailyStats,
+    PeriodStats,
+)
+
+
+# Rows removed per DELETE statement during cleanup, so each write
+# transaction stays short on libSQL
+CLEANUP_BATCH_SIZE = 10000
+
+def _insert_sql(model, columns) -> str:
+    """Return a parameterized INSERT statement for ``columns`` of ``model``."""
+    qn = connection.ops.quote_name
+    return "INSERT INTO {} ({}) VALUES ({})".format(
+        qn(model._meta.db_table),
+        ", ".join(qn(column) for column in columns),
+        ", ".join(["%s"] * len(columns)),
+    )
+
+
+# Raw inserts used by the flush thread so each batch is a single executemany
+PAGEVIEW_COLUMNS = (
+    "website_id",
+    "session_id",
+    "page_path",
+    "page_title",
+    "ip_address",
+    "user_agent",
+    "referrer_url",
+    "referrer_domain",
+    "device_type",
+    "browser",
+    "os",
+    "country",
+    "city",
+    "page_load_time",
+    "timestamp",
+    "created_at",
+)
+PAGEVIEW_INSERT_SQL = _insert_sql(PageView, PAGEVIEW_COLUMNS)
+
+EVENT_COLUMNS = (
+    "website_id",
+    "session_id",
+    "pageview_id",
+    "event_type",
+    "event_name",
+    "event_value",
+    "event_data",
+    "timestamp",
+    "created_at",
 )
+EVENT_INSERT_SQL = _insert_sql(Event, EVENT_COLUMNS)
+
+# HourlyStats counters that are summed into DailyStats
+DAILY_ROLLUP_FIELDS = ("pageviews", "unique_visitors", "sessions", "bounces", "events")
+
+
+@lru_cache(maxsize=1024)
+def _get_website_id(tracking_id: str) -> int:
+    """Return the primary key of the website with ``tracking_id``."""
+    return Website.objects.values_list("id", flat=True).get(tracking_id=tracking_id)
+
+
+@receiver([post_save, post_delete], sender=Website)
+def _clear_website_id_cache(sender, **kwargs):
+    """Forget cached website ids whenever a website changes."""
+    _get_website_id.cache_clear()
+
+
+def _raw_delete_in_batches(queryset) -> int:
+    """
+    Delete the rows matched by ``queryset`` in bounded batches.
+
+    Uses ``_raw_delete`` so no collector, cascade lookups or signals are run;
+    callers must remove any dependent rows first.
+    """
+    model = queryset.model
+    deleted = 0
+    while True:
+        batch = model._base_manager.filter(
+            pk__in=queryset.order_by().values("pk")[:CLEANUP_BATCH_SIZE]
+        )
+        with transaction.atomic(using=batch.db):
+            count = batch._raw_delete(batch.db)
+        deleted += count
+        if count < CLEANUP_BATCH_SIZE:
+            return deleted
+
+
+def _seconds_since(field_name: str, now: datetime) -> Cast:
+    """SQL expression for the whole seconds elapsed from ``field_name`` to ``now``."""
+    elapsed_days = Func(
+        Value(now, output_field=DateTimeField()),
+        function="julianday",
+        output_field=FloatField(),
+    ) - Func(F(field_name), function="julianday", output_field=FloatField())
+    return Cast(elapsed_days * 86400, IntegerField())
+
+
+def _truncate_to_hour(value: datetime) -> datetime:
+    """Return the start of the hour containing ``value``."""
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _weighted(stats: Dict[str, Any], avg_field: str, weight_field: str) -> float:
+    """Return ``avg * weight`` for a stats row, treating missing values as 0."""
+    return (stats.get(avg_field) or 0) * stats.get(weight_field, 0)
+
+
+def _shift_weighted_avg(avg, weight, new_weight, old_part, new_part):
+    """Replace one part's contribution in a weighted average."""
+    if new_weight <= 0:
+        return None
+    return ((avg or 0) * weight - old_part + new_part) / new_weight
+
+
+@dataclass
+class HourBucket:
+    """Running aggregates for one website and hour, updated at flush time."""
+
+    pageviews: int = 0
+    visitors: set = field(default_factory=set)
+    # Sessions started in this hour:
+    # session_id -> [pageviews, duration_seconds, started_at]
+    sessions: Dict[str, List] = field(default_factory=dict)
+    events: int = 0
+    load_time_sum: float = 0.0
+    load_time_count: int = 0
+    page_paths: Counter = field(default_factory=Counter)
+    referrers: Counter = field(default_factory=Counter)
+    devices: Counter = field(default_factory=Counter)
+
+    def add_pageview(self, data: Dict[str, Any]):
+        """Fold a single pageview into the running totals."""
+        self.pageviews += 1
+        self.visitors.add(data["session_id"])
+        self.page_paths[data["page_path"]] += 1
+        if data.get("referrer_domain"):
+            self.referrers[data["referrer_domain"]] += 1
+        self.devices[data.get("device_type", "desktop")] += 1
+        if data.get("page_load_time") is not None:
+            self.load_time_sum += data["page_load_time"]
+            self.load_time_count += 1
+
+    def add_session_pageview(self, session_id: str, now: datetime):
+        """Record a pageview for a session that started in this hour."""
+        entry = self.sessions.setdefault(session_id, [0, 0, now])
+        entry[0] += 1
+        entry[1] = (now - entry[2]).total_seconds()
+
+    def as_stats(self) -> Dict[str, Any]:
+        """Return the bucket as ``HourlyStats`` field values."""
+        avg_load_time = None
+        if self.load_time_count:
+            avg_load_time = self.load_time_sum / self.load_time_count
+
+        avg_session_duration = None
+        if self.sessions:
+            avg_session_duration = sum(
+                duration for _, duration, _ in self.sessions.values()
+            ) / len(self.sessions)
+
+        return {
+            "pageviews": self.pageviews,
+            "unique_visitors": len(self.visitors),
+            "sessions": len(self.sessions),
+            "bounces": sum(1 for count, *_ in self.sessions.values() if count == 1),
+            "events": self.events,
+            "avg_page_load_time": avg_load_time,
+            "avg_session_duration": avg_session_duration,
+            **self.top_lists(),
+        }
+
+    def top_lists(self) -> Dict[str, Any]:
+        """Return the top pages/referrers and device breakdown fields."""
+        return {
+            "top_pages": [
+                {"page_path": path, "views": views}
+                for path, views in self.page_paths.most_common(10)
+            ],
+            "top_referrers": [
+                {"referrer_domain": domain, "count": count}
+                for domain, count in self.referrers.most_common(10)
+            ],
+            "device_breakdown": dict(self.devices),
+        }
 
 
 class RealtimeTracker:
@@ -27,7 +231,25 @@ class RealtimeTracker:
     def __init__(self):
         self.event_buffer = defaultdict(list)
         self.buffer_lock = threading.Lock()
-        self.flush_interval = 1.0  # Flush every second
+        # Incremental per-(website_id, hour) aggregates, merged into
+        # HourlyStats by the aggregation loop instead of rescanning raw rows.
+        self.hour_agg: Dict[Tuple[int, datetime], HourBucket] = {}
+        self.agg_lock = threading.Lock()
+        # session_id -> bucket key of the hour the session started in
+        self.session_hours: Dict[str, Tuple[int, datetime]] = {}
+        self.started_at = timezone.now()
+        # Flush when the buffer reaches a full batch or its oldest entry is
+        # older than flush_interval, whichever comes first.
+        self.max_batch_size = getattr(settings, "ANALYTICS_SETTINGS", {}).get(
+            "MAX_EVENTS_PER_BATCH", 100
+        )
+        self.flush_interval = 5.0
+        self.flush_event = threading.Event()
+        self.buffer_first_ts = None
+        # Cap buffered events so a stalled flush cannot grow memory without
+        # bound; events arriving while the buffer is full are dropped.
+        self.max_buffer_size = self.max_batch_size * 10
+        self.dropped_events = 0
         self.aggregation_interval = 60  # Aggregate every minute
         self.is_running = False
 
@@ -52,19 +274,50 @@ class RealtimeTracker:
 
     def track_pageview(self, data: Dict[str, Any]):
         """Track a page view event."""
-        with self.buffer_lock:
-            self.event_buffer["pageviews"].append(data)
+        self._enqueue("pageviews", data)
 
     def track_event(self, data: Dict[str, Any]):
         """Track a custom event."""
+        self._enqueue("events", data)
+
+    def _enqueue(self, stream: str, data: Dict[str, Any]):
+        """Buffer an event and wake the flush thread once a batch is full."""
         with self.buffer_lock:
-            self.event_buffer["events"].append(data)
+            buffered = self._buffered_count()
+            if buffered >= self.max_buffer_size:
+                self.dropped_events += 1
+                return
+            if self.buffer_first_ts is None:
+                self.buffer_first_ts = time.monotonic()
+            self.event_buffer[stream].append(data)
+            buffered += 1
+
+        if buffered >= self.max_batch_size:
+            self.flush_event.set()
 
     def _flush_loop(self):
         """Continuously flush events to database."""
         while self.is_running:
-            time.sleep(self.flush_interval)
-            self._flush_events()
+            first_ts = self.buffer_first_ts
+            timeout = self.flush_interval
+            if first_ts is not None:
+                timeout = max(0.0, first_ts + self.flush_interval - time.monotonic())
+
+            self.flush_event.wait(timeout=timeout)
+            self.flush_event.clear()
+
+            with self.buffer_lock:
+                first_ts = self.buffer_first_ts
+                batch_full = self._buffered_count() >= self.max_batch_size
+
+            if first_ts is not None and (
+                batch_full or time.monotonic() - first_ts >= self.flush_interval
+            ):
+                self._flush_events()
+
+    def _buffered_count(self) -> int:
+        """Return the number of buffered events; caller holds ``buffer_lock``."""
+        return len(self.event_buffer["pageviews"]) + len(self.event_buffer["events"])
 
     def _flush_events(self):
         """Flush buffered events to database."""
@@ -76,113 +329,219 @@ class RealtimeTracker:
             events = self.event_buffer["events"][:]
             self.event_buffer["pageviews"] = []
             self.event_buffer["events"] = []
+            self.buffer_first_ts = None
 
         if not pageviews and not events:
             return
 
+        # One clock reading for the whole batch
+        batch_now = timezone.now()
+
         try:
-            with transaction.atomic():
-                # Process pageviews
+            website_ids = {}
+            for tracking_id in {d["tracking_id"] for d in pageviews + events}:
+                try:
+                    website_ids[tracking_id] = _get_website_id(tracking_id)
+                except Website.DoesNotExist:
+                    pass
+            pageviews = [d for d in pageviews if d["tracking_id"] in website_ids]
+            events = [d for d in events if d["tracking_id"] in website_ids]
+
+            db_now = connection.ops.adapt_datetimefield_value(batch_now)
+
+            # Bucket updates for the batch, applied only once its rows commit
+            agg_updates = []
+            with transaction.atomic(), connection.cursor() as cursor:
+                # Process pageviews: one executemany for the whole batch
+                if pageviews:
+                    cursor.executemany(
+                        PAGEVIEW_INSERT_SQL,
+                        [
+                            self._pageview_row(
+                                website_ids[d["tracking_id"]], d, db_now
+                            )
+                            for d in pageviews
+                        ],
+                    )
                 for pv_data in pageviews:
-                    self._process_pageview(pv_data)
-
-                # Process events
+                    self._process_pageview(
+                        website_ids[pv_data["tracking_id"]],
+                        pv_data,
+                        batch_now,
+                        agg_updates,
+                    )
+
+                # Process events, validating referenced pageviews in one query
+                linked = {d["pageview_id"] for d in events if d.get("pageview_id")}
+                pageview_ids = set(
+                    PageView.objects.filter(id__in=linked).values_list("id", flat=True)
+                    if linked
+                    else ()
+                )
+                if events:
+                    cursor.executemany(
+                        EVENT_INSERT_SQL,
+                        [
+                            self._event_row(
+                                website_ids[d["tracking_id"]], d, db_now, pageview_ids
+                            )
+                            for d in events
+                        ],
+                    )
                 for event_data in events:
-                    self._process_event(event_data)
+                    self._process_event(
+                        website_ids[event_data["tracking_id"]],
+                        event_data,
+                        batch_now,
+                        agg_updates,
+                    )
+
+                transaction.on_commit(partial(self._apply_agg_updates, agg_updates))
 
         except Exception as e:
             print(f"Error flushing events: {e}")
 
-    def _process_pageview(self, data: Dict[str, Any]):
-        """Process a single pageview."""
-        website = Website.objects.get(tracking_id=data["tracking_id"])
-
-        # Create pageview
-        pageview = PageView.objects.create(
-            website=website,
-            session_id=data["session_id"],
-            page_path=data["page_path"],
-            page_title=data.get("page_title", ""),
-            ip_address=data["ip_address"],
-            user_agent=data["user_agent"],
-            referrer_url=data.get("referrer_url", ""),
-            referrer_domain=data.get("referrer_domain", ""),
-            device_type=data.get("device_type", "desktop"),
-            browser=data.get("browser", "Unknown"),
-            os=data.get("os", "Unknown"),
-            country=data.get("country", ""),
-            city=data.get("city", ""),
-            page_load_time=data.get("page_load_time"),
-            timestamp=timezone.now(),
+    def _get_bucket(self, website_id: int, hour: datetime) -> HourBucket:
+        """Return the aggregation bucket for a website and hour."""
+        key = (website_id, hour)
+        bucket = self.hour_agg.get(key)
+        if bucket is None:
+            bucket = self.hour_agg[key] = HourBucket()
+        return bucket
+
+    def _apply_agg_updates(self, updates: List[partial]):
+        """Apply a committed batch's bucket updates."""
+        with self.agg_lock:
+            for update in updates:
+                update()
+
+    def _pageview_row(self, website_id: int, data: Dict[str, Any], db_now) -> tuple:
+        """Return the PAGEVIEW_COLUMNS values for a buffered pageview."""
+        return (
+            website_id,
+            data["session_id"],
+            data["page_path"],
+            data.get("page_title", ""),
+            data["ip_address"],
+            data["user_agent"],
+            data.get("referrer_url", ""),
+            data.get("referrer_domain", ""),
+            data.get("device_type", "desktop"),
+            data.get("browser", "Unknown"),
+            data.get("os", "Unknown"),
+            data.get("country", ""),
+            data.get("city", ""),
+            data.get("page_load_time"),
+            db_now,
+            db_now,
         )
 
+    def _process_pageview(
+        self,
+        website_id: int,
+        data: Dict[str, Any],
+        now: datetime,
+        agg_updates: List[partial],
+    ):
+        """Update visitor and session rows and queue the bucket update."""
         # Update realtime visitors
         RealtimeVisitor.objects.update_or_create(
-            website=website,
+            website_id=website_id,
             session_id=data["session_id"],
             defaults={
                 "page_path": data["page_path"],
                 "ip_address": data["ip_address"],
                 "country": data.get("country", ""),
                 "device_type": data.get("device_type", "desktop"),
-                "last_seen": timezone.now(),
+                "last_seen": now,
             },
         )
 
-        # Update or create session
-        session, created = Session.objects.get_or_create(
-            session_id=data["session_id"],
-            defaults={
-                "website": website,
-                "started_at": timezone.now(),
-                "ip_address": data["ip_address"],
-                "country": data.get("country", ""),
-                "device_type": data.get("device_type", "desktop"),
-                "browser": data.get("browser", "Unknown"),
-                "entry_page": data["page_path"],
-            },
+        # Update the session in a single statement, with duration and bounce
+        # computed by the database; create it if this is its first pageview.
+        session_id = data["session_id"]
+        updated = Session.objects.filter(session_id=session_id).update(
+            pageview_count=F("pageview_count") + 1,
+            ended_at=now,
+            exit_page=data["page_path"],
+            duration_seconds=_seconds_since("started_at", now),
+            bounce=Case(When(pageview_count=0, then=Value(True)), default=Value(False)),
+            updated_at=now,
+        )
+        if not updated:
+            Session.objects.create(
+                website_id=website_id,
+                session_id=session_id,
+                started_at=now,
+                ended_at=now,
+                pageview_count=1,
+                bounce=True,
+                ip_address=data["ip_address"],
+                country=data.get("country", ""),
+                device_type=data.get("device_type", "desktop"),
+                browser=data.get("browser", "Unknown"),
+                entry_page=data["page_path"],
+                exit_page=data["page_path"],
+            )
+
+        agg_updates.append(
+            partial(self._bucket_pageview, website_id, data, now, not updated)
         )
 
-        if not created:
-            # Update existing session
-            session.pageview_count = F("pageview_count") + 1
-            session.ended_at = timezone.now()
-            session.exit_page = data["page_path"]
-            session.duration_seconds = (
-                timezone.now() - session.started_at
-            ).total_seconds()
-            session.bounce = session.pageview_count == 1
-            session.save()
-
-    def _process_event(self, data: Dict[str, Any]):
-        """Process a custom event."""
-        website = Website.objects.get(tracking_id=data["tracking_id"])
-
-        # Find associated pageview if any
-        pageview = None
-        if data.get("pageview_id"):
-            try:
-                pageview = PageView.objects.get(id=data["pageview_id"])
-            except PageView.DoesNotExist:
-                pass
-
-        # Create event
-        Event.objects.create(
-            website=website,
-            session_id=data["session_id"],
-            pageview=pageview,
-            event_type=data["event_type"],
-            event_name=data["event_name"],
-            event_value=data.get("event_value", ""),
-            event_data=data.get("event_data", {}),
-            timestamp=timezone.now(),
+    def _bucket_pageview(
+        self, website_id: int, data: Dict[str, Any], now: datetime, new_session: bool
+    ):
+        """Fold a committed pageview into its buckets; caller holds ``agg_lock``."""
+        hour = _truncate_to_hour(now)
+        self._get_bucket(website_id, hour).add_pageview(data)
+        # Sessions are attributed to the bucket of the hour they started in
+        session_id = data["session_id"]
+        if new_session:
+            self.session_hours[session_id] = (website_id, hour)
+        session_bucket = self.hour_agg.get(self.session_hours.get(session_id))
+        if session_bucket is not None:
+            session_bucket.add_session_pageview(session_id, now)
+
+    def _event_row(
+        self, website_id: int, data: Dict[str, Any], db_now, pageview_ids
+    ) -> tuple:
+        """Return the EVENT_COLUMNS values for a buffered custom event."""
+        # Link the pageview by id only if it exists; no row is fetched
+        pageview_id = data.get("pageview_id")
+        if pageview_id not in pageview_ids:
+            pageview_id = None
+
+        return (
+            website_id,
+            data["session_id"],
+            pageview_id,
+            data["event_type"],
+            data["event_name"],
+            data.get("event_value", ""),
+            json.dumps(data.get("event_data", {})),
+            db_now,
+            db_now,
         )
 
+    def _process_event(
+        self,
+        website_id: int,
+        data: Dict[str, Any],
+        now: datetime,
+        agg_updates: List[partial],
+    ):
+        """Update the session row and queue the bucket update for an event."""
         # Update session event count
         Session.objects.filter(session_id=data["session_id"]).update(
             event_count=F("event_count") + 1
         )
 
+        agg_updates.append(partial(self._bucket_event, website_id, now))
+
+    def _bucket_event(self, website_id: int, now: datetime):
+        """Count a committed event in its bucket; caller holds ``agg_lock``."""
+        self._get_bucket(website_id, _truncate_to_hour(now)).events += 1
+
     def _aggregation_loop(self):
         """Continuously aggregate statistics."""
         while self.is_running:
@@ -195,17 +554,69 @@ class RealtimeTracker:
         connections.close_all()
 
         try:
+            self._finalize_past_hours()
             for website in Website.objects.filter(is_active=True):
                 self._aggregate_website_stats(website)
         except Exception as e:
             print(f"Error aggregating stats: {e}")
 
+    def _finalize_past_hours(self):
+        """Merge buckets for hours that have ended one last time, then drop them."""
+        current_hour = _truncate_to_hour(timezone.now())
+        with self.agg_lock:
+            finished = [key for key in self.hour_agg if key[1] < current_hour]
+            stats = {}
+            for key in finished:
+                bucket = self.hour_agg.pop(key)
+                stats[key] = bucket.as_stats()
+                for session_id in bucket.sessions:
+                    self.session_hours.pop(session_id, None)
+
+        for (website_id, hour), defaults in stats.items():
+            if self.started_at <= hour:
+                self._store_hourly_stats(website_id, hour, defaults)
+
     def _aggregate_website_stats(self, website: Website):
         """Aggregate stats for a single website."""
-        now = timezone.now()
-        current_hour = now.replace(minute=0, second=0, microsecond=0)
-        hour_ago = now - timedelta(hours=1)
+        current_hour = _truncate_to_hour(timezone.now())
+
+        # The bucket only holds every pageview of the hour if the tracker was
+        # already running when the hour started; otherwise rescan the tables.
+        if current_hour < self.started_at:
+            stats = self._scan_hour_stats(website, current_hour)
+        else:
+            # No bucket yet simply means no traffic so far this hour.
+            with self.agg_lock:
+                bucket = self.hour_agg.get((website.id, current_hour)) or HourBucket()
+                stats = bucket.as_stats()
+
+        self._store_hourly_stats(website.id, current_hour, stats)
+
+    def _store_hourly_stats(self, website_id: int, hour: datetime, stats: Dict):
+        """Upsert an HourlyStats row and roll its change up into DailyStats."""
+        # The roll-ups apply deltas, so the hour and its roll-ups must commit
+        # together.
+        with transaction.atomic():
+            previous = (
+                HourlyStats.objects.filter(website_id=website_id, hour=hour)
+                .values(
+                    *DAILY_ROLLUP_FIELDS, "avg_page_load_time", "avg_session_duration"
+                )
+                .first()
+            )
 
+            # Update or create hourly stats
+            HourlyStats.objects.update_or_create(
+                website_id=website_id,
+                hour=hour,
+                defaults=stats,
+            )
+
+            # Update daily stats
+            self._update_daily_stats(website_id, hour.date(), previous or {}, stats)
+
+    def _scan_hour_stats(self, website: Website, current_hour: datetime):
+        """Compute hourly stats from the raw tables."""
         # Get pageviews for current hour
         hour_pageviews = PageView.objects.filter(
             website=website,
@@ -213,20 +624,24 @@ class RealtimeTracker:
             timestamp__lt=current_hour + timedelta(hours=1),
         )
 
-        # Calculate metrics
-        pageview_count = hour_pageviews.count()
-        unique_visitors = hour_pageviews.values("session_id").distinct().count()
+        # Scalar pageview metrics in one pass
+        pv_agg = hour_pageviews.aggregate(
+            pv=Count("id"),
+            uv=Count("session_id", distinct=True),
+            avg_load=Avg("page_load_time"),
+        )
 
-        # Get sessions for current hour
-        hour_sessions = Session.objects.filter(
+        # Session metrics for sessions started in the current hour
+        sess_agg = Session.objects.filter(
             website=website,
             started_at__gte=current_hour,
             started_at__lt=current_hour + timedelta(hours=1),
+        ).aggregate(
+            sessions=Count("id"),
+            bounces=Count("id", filter=Q(bounce=True)),
+            avg_dur=Avg("duration_seconds"),
         )
 
-        session_count = hour_sessions.count()
-        bounce_count = hour_sessions.filter(bounce=True).count()
-
         # Get events for current hour
         event_count = Event.objects.filter(
             website=website,
@@ -234,90 +649,151 @@ class RealtimeTracker:
             timestamp__lt=current_hour + timedelta(hours=1),
         ).count()
 
-        # Performance metrics
-        avg_load_time = hour_pageviews.aggregate(avg=Avg("page_load_time"))["avg"]
-
-        avg_session_duration = hour_sessions.aggregate(avg=Avg("duration_seconds"))[
-            "avg"
-        ]
-
-        # Top pages
-        top_pages = list(
-            hour_pageviews.values("page_path")
+        # Top pages, referrers and devices from a single grouped pass
+        bucket = HourBucket()
+        for path, referrer, device, views in (
+            hour_pageviews.order_by()
+            .values_list("page_path", "referrer_domain", "device_type")
             .annotate(views=Count("id"))
-            .order_by("-views")[:10]
-        )
+        ):
+            bucket.page_paths[path] += views
+            if referrer:
+                bucket.referrers[referrer] += views
+            bucket.devices[device] += views
+
+        return {
+            "pageviews": pv_agg["pv"],
+            "unique_visitors": pv_agg["uv"],
+            "sessions": sess_agg["sessions"],
+            "bounces": sess_agg["bounces"],
+            "events": event_count,
+            "avg_page_load_time": pv_agg["avg_load"],
+            "avg_session_duration": sess_agg["avg_dur"],
+            **bucket.top_lists(),
+        }
+
+    def _update_daily_stats(
+        self, website_id: int, day, previous: Dict[str, Any], current: Dict[str, Any]
+    ):
+        """Apply the change of one HourlyStats row to the day's DailyStats."""
+        daily = DailyStats.objects.filter(website_id=website_id, date=day).first()
+        if daily is None:
+            # First roll-up of the day: sum whatever hours are already stored.
+            self._rebuild_daily_stats(website_id, day)
+            return
 
-        # Top referrers
-        top_referrers = list(
-            hour_pageviews.exclude(referrer_domain="")
-            .values("referrer_domain")
-            .annotate(count=Count("id"))
-            .order_by("-count")[:10]
+        deltas = {
+            name: current[name] - previous.get(name, 0)
+            for name in DAILY_ROLLUP_FIELDS
+        }
+        totals = {name: getattr(daily, name) + deltas[name] for name in deltas}
+
+        # Daily averages are kept weighted by pageviews/sessions so they can be
+        # adjusted by the hour's delta without revisiting the other hours.
+        avg_load_time = _shift_weighted_avg(
+            daily.avg_page_load_time,
+            daily.pageviews,
+            totals["pageviews"],
+            _weighted(previous, "avg_page_load_time", "pageviews"),
+            _weighted(current, "avg_page_load_time", "pageviews"),
         )
-
-        # Device breakdown
-        device_breakdown = dict(
-            hour_pageviews.values("device_type")
-            .annotate(count=Count("id"))
-            .values_list("device_type", "count")
+        avg_duration = _shift_weighted_avg(
+            daily.avg_session_duration,
+            daily.sessions,
+            totals["sessions"],
+            _weighted(previous, "avg_session_duration", "sessions"),
+            _weighted(current, "avg_session_duration", "sessions"),
         )
 
-        # Update or create hourly stats
-        HourlyStats.objects.update_or_create(
-            website=website,
-            hour=current_hour,
-            defaults={
-                "pageviews": pageview_count,
-                "unique_visitors": unique_visitors,
-                "sessions": session_count,
-                "bounces": bounce_count,
-                "events": event_count,
-                "avg_page_load_time": avg_load_time,
-                "avg_session_duration": avg_session_duration,
-                "top_pages": top_pages,
-                "top_referrers": top_referrers,
-                "device_breakdown": device_breakdown,
-            },
+        derived = self._derived_daily_metrics(website_id, day, totals)
+        DailyStats.objects.filter(pk=daily.pk).update(
+            **{name: F(name) + delta for name, delta in deltas.items()},
+            avg_page_load_time=avg_load_time,
+            avg_session_duration=avg_duration,
+            **derived,
+        )
+        self._update_period_stats(
+            website_id, day, deltas, daily.bounce_rate, derived["bounce_rate"]
         )
 
-        # Update daily stats
-        self._update_daily_stats(website)
-
-    def _update_daily_stats(self, website: Website):
-        """Update daily statistics."""
-        today = timezone.now().date()
-        today_start = datetime.combine(today, datetime.min.time())
-        today_end = today_start + timedelta(days=1)
+    def _rebuild_daily_stats(self, website_id: int, day):
+        """Recompute a day's statistics from all of its hourly stats."""
+        day_start = timezone.make_aware(datetime.combine(day, datetime.min.time()))
 
         # Aggregate from hourly stats
         daily_data = HourlyStats.objects.filter(
-            website=website, 
-            hour__gte=timezone.make_aware(today_start),
-            hour__lt=timezone.make_aware(today_end)
+            website_id=website_id,
+            hour__gte=day_start,
+            hour__lt=day_start + timedelta(days=1),
         ).aggregate(
+            # Weighted like the incremental path in _update_daily_stats().
+            # Listed first, so F() refers to the columns rather than the
+            # pageviews/sessions sums below.
+            load_time_total=Sum(
+                F("avg_page_load_time") * F("pageviews"), output_field=FloatField()
+            ),
+            duration_total=Sum(
+                F("avg_session_duration") * F("sessions"), output_field=FloatField()
+            ),
             pageviews=Sum("pageviews"),
             unique_visitors=Sum("unique_visitors"),
             sessions=Sum("sessions"),
             bounces=Sum("bounces"),
             events=Sum("events"),
-            avg_load_time=Avg("avg_page_load_time"),
-            avg_duration=Avg("avg_session_duration"),
         )
+        totals = {name: daily_data[name] or 0 for name in DAILY_ROLLUP_FIELDS}
+        avg_load_time = None
+        if totals["pageviews"] > 0:
+            avg_load_time = (daily_data["load_time_total"] or 0) / totals["pageviews"]
+        avg_duration = None
+        if totals["sessions"] > 0:
+            avg_duration = (daily_data["duration_total"] or 0) / totals["sessions"]
+        derived = self._derived_daily_metrics(website_id, day, totals)
 
-        # Calculate additional metrics
-        bounce_rate = None
-        if daily_data["sessions"] and daily_data["sessions"] > 0:
-            bounce_rate = (daily_data["bounces"] / daily_data["sessions"]) * 100
+        # Update or create daily stats
+        DailyStats.objects.update_or_create(
+            website_id=website_id,
+            date=day,
+            defaults={
+                **totals,
+                "avg_page_load_time": avg_load_time,
+                "avg_session_duration": avg_duration,
+                **derived,
+            },
+        )
+        self._update_period_stats(website_id, day, totals, None, derived["bounce_rate"])
+
+    def _update_period_stats(
+        self, website_id: int, day, deltas: Dict[str, int], old_rate, new_rate
+    ):
+        """Apply a change to one day's DailyStats to every window containing it."""
+        PeriodStats.objects.filter(
+            website_id=website_id, start_date__lte=day, end_date__gte=day
+        ).update(
+            pageviews=F("pageviews") + deltas["pageviews"],
+            visitors=F("visitors") + deltas["unique_visitors"],
+            sessions=F("sessions") + deltas["sessions"],
+            events=F("events") + deltas["events"],
+            bounce_rate_total=F("bounce_rate_total")
+            + (new_rate or 0)
+            - (old_rate or 0),
+            bounce_rate_days=F("bounce_rate_days")
+            + (new_rate is not None)
+            - (old_rate is not None),
+            updated_at=timezone.now(),
+        )
 
+    def _derived_daily_metrics(self, website_id: int, day, totals: Dict[str, int]):
+        """Calculate rates and growth from a day's running totals."""
+        bounce_rate = None
         pages_per_session = None
-        if daily_data["sessions"] and daily_data["sessions"] > 0:
-            pages_per_session = daily_data["pageviews"] / daily_data["sessions"]
+        if totals["sessions"] > 0:
+            bounce_rate = (totals["bounces"] / totals["sessions"]) * 100
+            pages_per_session = totals["pageviews"] / totals["sessions"]
 
         # Get yesterday's stats for growth calculation
-        yesterday = today - timedelta(days=1)
         yesterday_stats = DailyStats.objects.filter(
-            website=website, date=yesterday
+            website_id=website_id, date=day - timedelta(days=1)
         ).first()
 
         pageviews_growth = None
@@ -326,35 +802,23 @@ class RealtimeTracker:
         if yesterday_stats:
             if yesterday_stats.pageviews > 0:
                 pageviews_growth = (
-                    (daily_data["pageviews"] - yesterday_stats.pageviews)
+                    (totals["pageviews"] - yesterday_stats.pageviews)
                     / yesterday_stats.pageviews
                     * 100
                 )
             if yesterday_stats.unique_visitors > 0:
                 visitors_growth = (
-                    (daily_data["unique_visitors"] - yesterday_stats.unique_visitors)
+                    (totals["unique_visitors"] - yesterday_stats.unique_visitors)
                     / yesterday_stats.unique_visitors
                     * 100
                 )
 
-        # Update or create daily stats
-        DailyStats.objects.update_or_create(
-            website=website,
-            date=today,
-            defaults={
-                "pageviews": daily_data["pageviews"] or 0,
-                "unique_visitors": daily_data["unique_visitors"] or 0,
-                "sessions": daily_data["sessions"] or 0,
-                "bounces": daily_data["bounces"] or 0,
-                "bounce_rate": bounce_rate,
-                "events": daily_data["events"] or 0,
-                "avg_page_load_time": daily_data["avg_load_time"],
-                "avg_session_duration": daily_data["avg_duration"],
-                "pages_per_session": pages_per_session,
-                "pageviews_growth": pageviews_growth,
-                "visitors_growth": visitors_growth,
-            },
-        )
+        return {
+            "bounce_rate": bounce_rate,
+            "pages_per_session": pages_per_session,
+            "pageviews_growth": pageviews_growth,
+            "visitors_growth": visitors_growth,
+        }
 
     def _cleanup_loop(self):
         """Periodically clean up old data."""
@@ -371,17 +835,30 @@ class RealtimeTracker:
             # Clean up old realtime visitors
             RealtimeVisitor.cleanup_old()
 
-            # Clean up old pageviews (keep 30 days)
+            # Clean up old pageviews (keep 30 days). Events cascade from
+            # pageviews, so remove those pointing at expiring pageviews first.
             cutoff = timezone.now() - timedelta(days=30)
-            PageView.objects.filter(timestamp__lt=cutoff).delete()
-            Event.objects.filter(timestamp__lt=cutoff).delete()
+            _raw_delete_in_batches(Event.objects.filter(timestamp__lt=cutoff))
+            _raw_delete_in_batches(
+                Event.objects.filter(pageview__timestamp__lt=cutoff)
+            )
+            _raw_delete_in_batches(PageView.objects.filter(timestamp__lt=cutoff))
 
             # Clean up old sessions
-            Session.objects.filter(started_at__lt=cutoff).delete()
+            _raw_delete_in_batches(Session.objects.filter(started_at__lt=cutoff))
 
             # Keep hourly stats for 7 days
             hourly_cutoff = timezone.now() - timedelta(days=7)
-            HourlyStats.objects.filter(hour__lt=hourly_cutoff).delete()
+            _raw_delete_in_batches(HourlyStats.objects.filter(hour__lt=hourly_cutoff))
+
+            # Period roll-ups are only read for windows ending today or one
+            # period back, so drop any ending before the longest lookback
+            period_cutoff = timezone.now().date() - timedelta(
+                days=max(PeriodStats.PERIOD_DAYS.values()) + 1
+            )
+            _raw_delete_in_batches(
+                PeriodStats.objects.filter(end_date__lt=period_cutoff)
+            )
 
         except Exception as e:
             print(f"Error cleaning up old data: {e}")
@@ -1,14 +1,21 @@
 """Views for real-time analytics dashboard."""
 
+from django.core.cache import cache
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
-from django.db.models import Count, Avg, Sum, Q
+from django.db.models import Count, Q
 from django.utils import timezone
+from collections import Counter
 from datetime import datetime, timedelta
 import json
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 from .models import (
     Website,
     PageView,
@@ -17,9 +24,34 @@ from .models import (
     RealtimeVisitor,
     HourlyStats,
     DailyStats,
+    PeriodStats,
 )
 from .tracker import tracker
 
+# Seconds a computed realtime_data payload is served from the cache
+REALTIME_CACHE_TIMEOUT = 5
+
+
+def _json_loads(body):
+    """Decode a JSON request body."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _json_dumps(data):
+    """Encode ``data`` as JSON bytes/str for an HttpResponse body."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data)
+
+
+def _json_response(data, status=200):
+    """Return ``data`` as an application/json response."""
+    return HttpResponse(
+        _json_dumps(data), content_type="application/json", status=status
+    )
+
 
 def dashboard(request, tracking_id=None):
     """Main analytics dashboard."""
@@ -39,14 +71,16 @@ def dashboard(request, tracking_id=None):
         website=website, last_seen__gte=now - timedelta(minutes=5)
     ).count()
 
-    # Today's stats
-    today_stats = DailyStats.objects.filter(website=website, date=today).first()
-
     # Last 7 days
     week_ago = today - timedelta(days=7)
-    weekly_stats = DailyStats.objects.filter(
-        website=website, date__gte=week_ago, date__lte=today
-    ).order_by("date")
+    weekly_stats = list(
+        DailyStats.objects.filter(
+            website=website, date__gte=week_ago, date__lte=today
+        ).order_by("date")
+    )
+
+    # Today's stats are the last row of the week, if any
+    today_stats = next((day for day in weekly_stats if day.date == today), None)
 
     # Current hour stats
     current_hour = now.replace(minute=0, second=0, microsecond=0)
@@ -92,7 +126,7 @@ def dashboard(request, tracking_id=None):
         "websites": Website.objects.filter(is_active=True),
         "realtime_count": realtime_count,
         "today_stats": today_stats or {},
-        "weekly_stats": list(weekly_stats),
+        "weekly_stats": weekly_stats,
         "hour_stats": hour_stats or {},
         "top_pages": top_pages,
         "top_referrers": top_referrers,
@@ -107,22 +141,36 @@ def dashboard(request, tracking_id=None):
 @require_http_methods(["GET"])
 def realtime_data(request, tracking_id):
     """Get real-time data via AJAX."""
+    # Every open dashboard polls this endpoint; share one computation per site
+    # for a few seconds instead of querying libSQL once per client.
+    payload = cache.get_or_set(
+        f"rt:{tracking_id}",
+        lambda: _realtime_payload(tracking_id),
+        REALTIME_CACHE_TIMEOUT,
+    )
+    return HttpResponse(payload, content_type="application/json")
+
+
+def _realtime_payload(tracking_id):
+    """Build the realtime_data response body as a JSON string."""
     website = get_object_or_404(Website, tracking_id=tracking_id)
     now = timezone.now()
 
-    # Real-time visitors
-    visitors = RealtimeVisitor.objects.filter(
-        website=website, last_seen__gte=now - timedelta(minutes=5)
+    # Real-time visitors, fetched once and counted in Python
+    rows = list(
+        RealtimeVisitor.objects.filter(
+            website=website, last_seen__gte=now - timedelta(minutes=5)
+        ).values("page_path", "session_id")
     )
 
-    visitor_count = visitors.count()
+    visitor_count = len({row["session_id"] for row in rows})
 
     # Current visitors by page
-    by_page = list(
-        visitors.values("page_path")
-        .annotate(count=Count("session_id"))
-        .order_by("-count")[:10]
-    )
+    page_counts = Counter(row["page_path"] for row in rows)
+    by_page = [
+        {"page_path": page_path, "count": count}
+        for page_path, count in page_counts.most_common(10)
+    ]
 
     # Recent pageviews (last minute)
     recent_pageviews = PageView.objects.filter(
@@ -137,7 +185,7 @@ def realtime_data(request, tracking_id):
         .order_by("-count")[:5]
     )
 
-    return JsonResponse(
+    return _json_dumps(
         {
             "visitor_count": visitor_count,
             "pageviews_per_minute": recent_pageviews,
@@ -158,28 +206,21 @@ def hourly_data(request, tracking_id):
     end_time = timezone.now().replace(minute=0, second=0, microsecond=0)
     start_time = end_time - timedelta(hours=hours)
 
-    hourly_stats = HourlyStats.objects.filter(
-        website=website, hour__gte=start_time, hour__lte=end_time
-    ).order_by("hour")
+    rows = list(
+        HourlyStats.objects.filter(
+            website=website, hour__gte=start_time, hour__lte=end_time
+        )
+        .order_by("hour")
+        .values_list("hour", "pageviews", "unique_visitors", "events")
+    )
 
     # Format for charts
-    labels = []
-    pageviews = []
-    visitors = []
-    events = []
-
-    for stat in hourly_stats:
-        labels.append(stat.hour.strftime("%H:%M"))
-        pageviews.append(stat.pageviews)
-        visitors.append(stat.unique_visitors)
-        events.append(stat.events)
-
-    return JsonResponse(
+    return _json_response(
         {
-            "labels": labels,
-            "pageviews": pageviews,
-            "visitors": visitors,
-            "events": events,
+            "labels": [hour.strftime("%H:%M") for hour, *_ in rows],
+            "pageviews": [row[1] for row in rows],
+            "visitors": [row[2] for row in rows],
+            "events": [row[3] for row in rows],
         }
     )
 
@@ -189,7 +230,7 @@ def hourly_data(request, tracking_id):
 def track_pageview(request):
     """Track a pageview event."""
     try:
-        data = json.loads(request.body)
+        data = _json_loads(request.body)
 
         # Extract user info
         data["ip_address"] = request.META.get("REMOTE_ADDR", "0.0.0.0")
@@ -198,9 +239,9 @@ def track_pageview(request):
         # Track asynchronously
         tracker.track_pageview(data)
 
-        return JsonResponse({"status": "ok"})
+        return _json_response({"status": "ok"})
     except Exception as e:
-        return JsonResponse({"error": str(e)}, status=400)
+        return _json_response({"error": str(e)}, status=400)
 
 
 @csrf_exempt
@@ -208,14 +249,14 @@ def track_pageview(request):
 def track_event(request):
     """Track a custom event."""
     try:
-        data = json.loads(request.body)
+        data = _json_loads(request.body)
 
         # Track asynchronously
         tracker.track_event(data)
 
-        return JsonResponse({"status": "ok"})
+        return _json_response({"status": "ok"})
     except Exception as e:
-        return JsonResponse({"error": str(e)}, status=400)
+        return _json_response({"error": str(e)}, status=400)
 
 
 def compare_periods(request, tracking_id):
@@ -225,40 +266,21 @@ def compare_periods(request, tracking_id):
     # Get date ranges
     period = request.GET.get("period", "week")  # week, month, year
 
-    today = timezone.now().date()
-    if period == "week":
-        current_start = today - timedelta(days=7)
-        previous_start = current_start - timedelta(days=7)
-        previous_end = current_start - timedelta(days=1)
-    elif period == "month":
-        current_start = today - timedelta(days=30)
-        previous_start = current_start - timedelta(days=30)
-        previous_end = current_start - timedelta(days=1)
-    else:  # year
-        current_start = today - timedelta(days=365)
-        previous_start = current_start - timedelta(days=365)
-        previous_end = current_start - timedelta(days=1)
-
-    # Get stats for both periods
-    current_stats = DailyStats.objects.filter(
-        website=website, date__gte=current_start, date__lte=today
-    ).aggregate(
-        pageviews=Sum("pageviews"),
-        visitors=Sum("unique_visitors"),
-        sessions=Sum("sessions"),
-        bounce_rate=Avg("bounce_rate"),
-        events=Sum("events"),
-    )
+    if period not in PeriodStats.PERIOD_DAYS:
+        period = "year"
 
-    previous_stats = DailyStats.objects.filter(
-        website=website, date__gte=previous_start, date__lte=previous_end
-    ).aggregate(
-        pageviews=Sum("pageviews"),
-        visitors=Sum("unique_visitors"),
-        sessions=Sum("sessions"),
-        bounce_rate=Avg("bounce_rate"),
-        events=Sum("events"),
-    )
+    # The current window is summed from DailyStats; the finished previous
+    # one is served from its stored PeriodStats roll-up
+    today = timezone.now().date()
+    current_period = PeriodStats.get_for(website, period, today)
+    previous_end = current_period.start_date - timedelta(days=1)
+    previous_period = PeriodStats.get_for(website, period, previous_end)
+
+    current_start = current_period.start_date
+    previous_start = previous_period.start_date
+    metrics = ["pageviews", "visitors", "sessions", "bounce_rate", "events"]
+    current_stats = {name: getattr(current_period, name) for name in metrics}
+    previous_stats = {name: getattr(previous_period, name) for name in metrics}
 
     # Calculate changes
     changes = {}
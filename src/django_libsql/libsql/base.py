@@ -1,17 +1,74 @@
 from __future__ import annotations
 
+import enum
+import os
+import queue
 import re
 import time
 import threading
+from functools import lru_cache
+from operator import itemgetter
+
 import libsql
+from django.db import IntegrityError, OperationalError
 from django.db.backends.sqlite3 import base as sqlite_base
 from .creation import DatabaseCreation
 from .schema import DatabaseSchemaEditor
 from .features import DatabaseFeatures
 from .operations import DatabaseOperations
 
-# Regex to find %s placeholders
-FORMAT_QMARK_REGEX = re.compile(r"(?<!%)%s")
+# Regex to find %(name)s placeholders
+PYFORMAT_REGEX = re.compile(r"%\((\w+)\)s", re.ASCII)
+
+
+def _rewrite_format(query):
+    """Convert "format" style (%s) placeholders to "qmark" style (?)."""
+    # Park escaped %% on a NUL so "%%s" is not mistaken for a placeholder
+    return query.replace("%%", "\x00").replace("%s", "?").replace("\x00", "%")
+
+
+@lru_cache(maxsize=512)
+def _compile_named(query):
+    """
+    Rewrite a pyformat query to qmark style for executemany().
+
+    libSQL's executemany() only binds positional rows, so this also returns a
+    binder that turns each parameter dict into a tuple in placeholder order.
+    """
+    query = query.replace("%%", "\x00")
+    names = PYFORMAT_REGEX.findall(query)
+    rewritten = PYFORMAT_REGEX.sub("?", query).replace("\x00", "%")
+    if len(names) == 1:
+        name = names[0]
+        return rewritten, lambda row: (row[name],)
+    if not names:
+        return rewritten, lambda row: ()
+    return rewritten, itemgetter(*names)
+
+
+# Per-connection cap on remembered qmark rewrites
+QMARK_CACHE_SIZE = 256
+
+
+def _cached_format(cache, query):
+    """Return the qmark form of query, remembering it in a per-connection cache."""
+    rewritten = cache.get(query)
+    if rewritten is None:
+        rewritten = _rewrite_format(query)
+        if len(cache) >= QMARK_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del cache[next(iter(cache))]
+        cache[query] = rewritten
+    return rewritten
+
+
+@lru_cache(maxsize=512)
+def _rewrite_pyformat(query):
+    """Convert "pyformat" style (%(name)s) placeholders to "named" style (:name)."""
+    # Same %% sentinel as _rewrite_format, so the pattern needs no lookbehind
+    query = query.replace("%%", "\x00")
+    return PYFORMAT_REGEX.sub(r":\1", query).replace("\x00", "%")
+
 
 # Create a Database module that Django will use to recognize database exceptions
 class Database:
@@ -52,6 +109,67 @@ class Database:
     PARSE_DECLTYPES = 1
     PARSE_COLNAMES = 2
 
+# Markers libSQL puts in ValueError messages
+# Remote errors carry the SQLite error code; local files only report the
+# message, e.g. "UNIQUE constraint failed: t.a"
+_CONSTRAINT_MARKS = ("SQLITE_CONSTRAINT", "constraint failed")
+_STREAM_MARKS = ("stream not found", "Hrana:")
+
+
+def _error_message(exc):
+    """Return the message of a libSQL error without going through __str__."""
+    if exc.args and isinstance(exc.args[0], str):
+        return exc.args[0]
+    return str(exc)
+
+
+# URL schemes that mean NAME is a remote libSQL/Turso database
+REMOTE_URL_SCHEMES = ("libsql://", "wss://", "ws://", "https://", "http://")
+
+
+class ConnectionMode(enum.Enum):
+    """How get_new_connection() opens a database."""
+
+    MEMORY = "memory"
+    REMOTE = "remote"
+    EMBEDDED = "embedded"
+
+
+# Idle embedded replica / local file connections kept for reuse, keyed by
+# connect() arguments. Opening one means a file open plus sync handshake.
+# A pooled connection keeps its per-connection state (PRAGMAs set after
+# connecting, temp tables, attached databases); only OPTIONS["init_command"]
+# is run again for its next user.
+CONNECTION_POOL_SIZE = 16
+_CONN_POOL = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _connection_pool(key):
+    """Return the idle-connection queue for a pool key, creating it if needed."""
+    pool = _CONN_POOL.get(key)
+    if pool is None:
+        with _POOL_LOCK:
+            pool = _CONN_POOL.setdefault(
+                key, queue.Queue(maxsize=CONNECTION_POOL_SIZE)
+            )
+    return pool
+
+
+def close_pooled_connections():
+    """Close and forget every idle pooled libSQL connection."""
+    with _POOL_LOCK:
+        pools = list(_CONN_POOL.values())
+        _CONN_POOL.clear()
+    for pool in pools:
+        while True:
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+
 # No-GIL connection handling
 CONNECTION_RETRY_COUNT = 3
 CONNECTION_RETRY_DELAY = 0.1
@@ -62,61 +180,71 @@ class LibSQLCursorWrapper:
     A wrapper for libSQL cursors to make them compatible with Django's expectations.
     """
 
+    # One wrapper is created per cursor; slots keep it small and attribute
+    # access on the execute path cheap
+    __slots__ = ("cursor", "db_wrapper", "qmark_cache")
+
     def __init__(self, cursor, db_wrapper=None):
         self.cursor = cursor
         self.db_wrapper = db_wrapper
+        # Connections are never shared across threads, so neither is this
+        self.qmark_cache = db_wrapper._qmark_cache if db_wrapper is not None else {}
 
     def execute(self, query, params=None):
-        from django.db import IntegrityError
-
         try:
             if params is None:
                 result = self.cursor.execute(query)
+            elif "%" not in query:
+                # No placeholders to convert (PRAGMA, BEGIN, SAVEPOINT, ...)
+                result = self.cursor.execute(query, params)
             elif isinstance(params, (list, tuple)):
                 # Convert from "format" style (%s) to "qmark" style (?)
-                query = FORMAT_QMARK_REGEX.sub("?", query).replace("%%", "%")
+                query = _cached_format(self.qmark_cache, query)
                 result = self.cursor.execute(query, params)
             elif isinstance(params, dict):
                 # Convert from "pyformat" style (%(name)s) to "named" style (:name)
-                query = query % {name: f":{name}" for name in params}
+                query = _rewrite_pyformat(query)
                 result = self.cursor.execute(query, params)
             else:
                 result = self.cursor.execute(query, params)
             
             return result
         except ValueError as e:
-            error_str = str(e)
+            error_str = _error_message(e)
             # Convert libSQL constraint errors to Django IntegrityError
-            if "SQLITE_CONSTRAINT" in error_str:
+            if any(mark in error_str for mark in _CONSTRAINT_MARKS):
                 raise IntegrityError(error_str)
             # Convert stream errors to OperationalError that Django recognizes
-            elif "stream not found" in error_str or "Hrana:" in error_str:
+            elif any(mark in error_str for mark in _STREAM_MARKS):
                 raise Database.OperationalError(error_str) from e
             raise
 
     def executemany(self, query, param_list):
-        # Convert query format for executemany as well
-        if param_list:
-            # Check if first item is dict (named params) or list/tuple (positional)
-            first_param = next(iter(param_list), None)
-            if first_param:
-                if isinstance(first_param, dict):
-                    # Named parameters
-                    query = query % {name: f":{name}" for name in first_param}
-                else:
-                    # Positional parameters
-                    query = FORMAT_QMARK_REGEX.sub("?", query).replace("%%", "%")
+        # libSQL only accepts a list, and the first row decides the style
+        if not isinstance(param_list, list):
+            param_list = list(param_list)
+        # Convert query format for executemany as well, once for all rows
+        if param_list and "%" in query:
+            if isinstance(param_list[0], dict):
+                # Named parameters, bound positionally
+                query, binder = _compile_named(query)
+                param_list = [binder(params) for params in param_list]
+            else:
+                # Positional parameters
+                query = _cached_format(self.qmark_cache, query)
         return self.cursor.executemany(query, param_list)
 
-    def fetchone(self):
-        from django.db import IntegrityError
+    def executescript(self, sql_script):
+        return self.cursor.executescript(sql_script)
 
+    def fetchone(self):
         try:
             return self.cursor.fetchone()
         except ValueError as e:
             # Convert libSQL constraint errors to Django IntegrityError
-            if "SQLITE_CONSTRAINT" in str(e):
-                raise IntegrityError(str(e))
+            error_str = _error_message(e)
+            if any(mark in error_str for mark in _CONSTRAINT_MARKS):
+                raise IntegrityError(error_str)
             raise
 
     def fetchmany(self, size=None):
@@ -178,64 +306,117 @@ class DatabaseWrapper(sqlite_base.DatabaseWrapper):
     
     # Set the Database module so Django recognizes our exceptions
     Database = Database
+
+    # ((NAME, OPTIONS), (mode, target, kwargs, pool key)) from the last
+    # _resolve_connection()
+    _resolved_connection = None
+
+    # Pool the current connection is returned to on close, if any
+    _pool_key = None
+
+    # Set when the current connection failed and must not be pooled
+    _connection_broken = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Rewritten %s queries, shared by every cursor of this connection
+        self._qmark_cache = {}
+        # DDL buffered by an open schema editor, or None when not buffering
+        self.pending_ddl = None
     
 
     def get_new_connection(self, conn_params):
-        import os
-        import libsql
-
         # For embedded replicas, NAME is your local file (e.g. local.db).
         # For local-only, set NAME to a file and omit SYNC_URL/AUTH_TOKEN.
         # For remote-only, you can set NAME to the remote URL and omit SYNC_URL.
         name = conn_params.get("NAME") or self.settings_dict.get("NAME") or ":memory:"
 
+        if not isinstance(name, str):
+            # e.g. NAME = BASE_DIR / "local.db"
+            name = os.fspath(name)
+
+        mode, target, kwargs, pool_key = self._resolve_connection(name)
+        self._pool_key = pool_key
+        if mode is ConnectionMode.MEMORY:
+            # Create a pure in-memory database without sync
+            return libsql.connect(":memory:")
+        if pool_key is not None:
+            try:
+                return _connection_pool(pool_key).get_nowait()
+            except queue.Empty:
+                pass
+        return libsql.connect(target, **kwargs)
+
+    def init_connection_state(self):
+        super().init_connection_state()
+        # OPTIONS["init_command"], split by the SQLite backend's
+        # get_connection_params(). Run for every connection handed out,
+        # pooled ones included, so none misses its PRAGMAs.
+        for init_command in self.init_commands:
+            if init_command := init_command.strip():
+                self.connection.execute(init_command)
+
+    def _resolve_connection(self, name):
+        """
+        Return the (mode, target, connect kwargs, pool key) for NAME.
+
+        The result only depends on the settings, so it is worked out on the
+        first connect and reused for every new connection with the same NAME
+        and OPTIONS.
+        """
+        cached = self._resolved_connection
+        # OPTIONS decide how a pooled connection was set up (init_command,
+        # ...), so they are part of the pool key and of this cache's key
+        options = repr(sorted(self.settings_dict.get("OPTIONS", {}).items()))
+        if cached is not None and cached[0] == (name, options):
+            return cached[1]
+
+        target = name
         # CRITICAL FIX: During tests, Django passes ":memory:" but we want to use TEST['NAME']
         # if it's configured to point to a Turso database
-        if name == ":memory:":
+        if target == ":memory:":
             test_name = self.settings_dict.get("TEST", {}).get("NAME")
-            if test_name and (
-                test_name.startswith("libsql://")
-                or test_name.startswith("wss://")
-                or test_name.startswith("https://")
-            ):
-                name = test_name
-
-        # Check if this is an in-memory database (NOT including Turso URLs)
-        is_memory_db = (
-            name == ":memory:"
-            or name.startswith("file:memory")
-            or name.startswith("file::memory:")
-            or "mode=memory" in str(name)
-        )
-
-        # Pull libSQL/Turso options either from settings or env vars.
-        sync_url = self.settings_dict.get("SYNC_URL") or os.getenv("TURSO_DATABASE_URL")
-        auth_token = self.settings_dict.get("AUTH_TOKEN") or os.getenv(
-            "TURSO_AUTH_TOKEN"
-        )
+            if test_name and test_name.startswith(("libsql://", "wss://", "https://")):
+                target = test_name
+
+        # Pull libSQL/Turso options from settings, falling back to env vars
+        # only when a setting is missing.
+        sync_url = self.settings_dict.get("SYNC_URL")
+        if not sync_url:
+            sync_url = os.environ.get("TURSO_DATABASE_URL")
+        auth_token = self.settings_dict.get("AUTH_TOKEN")
+        if not auth_token:
+            auth_token = os.environ.get("TURSO_AUTH_TOKEN")
         sync_interval = self.settings_dict.get("SYNC_INTERVAL")
         encryption_key = self.settings_dict.get("ENCRYPTION_KEY")
 
         kwargs = {}
 
         # For in-memory databases (but NOT Turso URLs)
-        if is_memory_db:
-            # Create a pure in-memory database without sync
-            conn = libsql.connect(":memory:")
+        if (
+            target == ":memory:"
+            or target.startswith(("file:memory", "file::memory:"))
+            or "mode=memory" in target
+        ):
+            mode = ConnectionMode.MEMORY
         # If NAME looks like a remote DSN (libsql://, wss://, https://), call connect(name, ...).
         # Otherwise, treat NAME as the local replica path and pass sync_* options.
-        elif isinstance(name, str) and name.startswith(
-            ("libsql://", "wss://", "ws://", "https://", "http://")
-        ):
+        elif target.startswith(REMOTE_URL_SCHEMES):
+            mode = ConnectionMode.REMOTE
             if auth_token:
                 kwargs["auth_token"] = auth_token
             # IMPORTANT: For remote Turso connections, we should also support sync_interval
             # This helps ensure changes are visible across connections in threading scenarios
             if sync_interval is not None:
                 kwargs["sync_interval"] = float(sync_interval)
-            conn = libsql.connect(str(name), **kwargs)
         else:
             # This is the embedded replica case - local file with sync_url
+            mode = ConnectionMode.EMBEDDED
+            # Autocommit like Django's SQLite backend: by default the driver
+            # opens an implicit transaction on the first write and nothing
+            # commits it, so the file stays locked for other connections.
+            # Django starts transactions itself with an explicit BEGIN.
+            kwargs["isolation_level"] = None
             if sync_url:
                 kwargs["sync_url"] = sync_url
             if auth_token:
@@ -244,14 +425,22 @@ class DatabaseWrapper(sqlite_base.DatabaseWrapper):
                 kwargs["sync_interval"] = float(sync_interval)
             if encryption_key:
                 kwargs["encryption_key"] = encryption_key
-            
-            conn = libsql.connect(str(name), **kwargs)
 
-        return conn
+        # Only local files are pooled: an idle remote connection's server-side
+        # stream can expire, and each in-memory connection is its own database.
+        pool_key = None
+        if mode is ConnectionMode.EMBEDDED:
+            pool_key = (target, tuple(sorted(kwargs.items())), options)
+
+        resolved = (mode, target, kwargs, pool_key)
+        self._resolved_connection = ((name, options), resolved)
+        return resolved
 
     def _set_autocommit(self, autocommit):
         """Override to handle libSQL's connection object differences"""
-        # libSQL doesn't have isolation_level property like standard SQLite
+        # libSQL's isolation_level can only be set when connecting (see
+        # _resolve_connection()); transactions always start with an explicit
+        # BEGIN in _start_transaction_under_autocommit()
         pass
 
     def _start_transaction_under_autocommit(self):
@@ -262,10 +451,8 @@ class DatabaseWrapper(sqlite_base.DatabaseWrapper):
         # Check if we're already in a transaction
         if self.connection and hasattr(self.connection, 'in_transaction') and self.connection.in_transaction:
             return  # Already in transaction, don't start another
-        # Start a transaction explicitly
-        cursor = self.create_cursor()
-        cursor.execute("BEGIN")
-        cursor.close()
+        # Start a transaction explicitly, straight on the libSQL connection
+        self.connection.execute("BEGIN")
 
     def create_cursor(self, name=None):
         """Override to handle libSQL's cursor creation"""
@@ -281,8 +468,9 @@ class DatabaseWrapper(sqlite_base.DatabaseWrapper):
         Disable foreign key constraint checking.
         libSQL/Turso handles this differently than SQLite.
         """
-        with self.cursor() as cursor:
-            cursor.execute("PRAGMA foreign_keys = OFF")
+        self.ensure_connection()
+        with self.wrap_database_errors:
+            self.connection.execute("PRAGMA foreign_keys = OFF")
         self.needs_rollback = False
         return True
 
@@ -290,8 +478,10 @@ class DatabaseWrapper(sqlite_base.DatabaseWrapper):
         """
         Enable foreign key constraint checking.
         """
-        with self.cursor() as cursor:
-            cursor.execute("PRAGMA foreign_keys = ON")
+        self.flush_pending_ddl()
+        self.ensure_connection()
+        with self.wrap_database_errors:
+            self.connection.execute("PRAGMA foreign_keys = ON")
 
 
     def is_in_memory_db(self):
@@ -305,13 +495,16 @@ class DatabaseWrapper(sqlite_base.DatabaseWrapper):
 
     def _commit(self):
         """Override commit to ensure it works with libSQL."""
-        if self.connection is not None:
+        # The connection knows whether a transaction is open; committing
+        # without one would only cost a COMMIT round-trip.
+        if self.connection is not None and self.connection.in_transaction:
             with self.wrap_database_errors:
                 try:
                     return self.connection.commit()
                 except ValueError as e:
                     if "stream not found" in str(e):
                         # Connection lost, can't commit
+                        self._connection_broken = True
                         self.close()
                         raise
                     else:
@@ -334,24 +527,55 @@ class DatabaseWrapper(sqlite_base.DatabaseWrapper):
                 cursor.fetchone()
             return True
         except Exception:
-            # Connection is not usable
+            # Connection is not usable; don't pool it when it gets closed
+            self._connection_broken = True
             return False
 
     def cursor(self):
         """Override Django's cursor method to handle stream connection recovery."""
+        # Anything that reads or writes must see the buffered DDL applied first
+        if self.pending_ddl:
+            self.flush_pending_ddl()
         return super().cursor()
 
+    def flush_pending_ddl(self):
+        """Run buffered schema editor statements as one script (one round-trip)."""
+        if not self.pending_ddl:
+            return
+        statements, self.pending_ddl = self.pending_ddl, []
+        self.ensure_connection()
+        with self.wrap_database_errors:
+            self.connection.executescript(
+                "".join(f"{sql.rstrip().rstrip(';')};\n" for sql in statements)
+            )
+
     def close(self):
         """Close the database connection."""
+        # A connection closed after a database error must not be pooled
+        if self.errors_occurred:
+            self._connection_broken = True
         # Reset error state when closing
         self.errors_occurred = False
         super().close()
     
     def _close(self):
-        """Close the database connection."""
+        """Close the database connection, or return it to the pool if idle."""
         if self.connection is not None:
-            self.connection.close()
-            self.connection = None
+            conn, self.connection = self.connection, None
+            broken, self._connection_broken = self._connection_broken, False
+            # Only pool connections that closed cleanly, and never hand on
+            # one with an open transaction
+            if (
+                self._pool_key is not None
+                and not broken
+                and not conn.in_transaction
+            ):
+                try:
+                    _connection_pool(self._pool_key).put_nowait(conn)
+                    return
+                except queue.Full:
+                    pass
+            conn.close()
 
     def sync(self):
         """
@@ -364,8 +588,6 @@ class DatabaseWrapper(sqlite_base.DatabaseWrapper):
         Raises:
             OperationalError: If sync is not available (e.g., for pure remote connections)
         """
-        from django.db import OperationalError
-        
         self.ensure_connection()
         
         if self.connection is None:
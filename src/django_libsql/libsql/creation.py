@@ -64,6 +64,26 @@ class DatabaseCreation(SQLiteDatabaseCreation):
         # Otherwise use default SQLite behavior
         return super().create_test_db(verbosity, autoclobber, serialize, keepdb)
 
+    def _create_test_db(self, verbosity, autoclobber, keepdb=False):
+        """
+        Erase the old test database file, without stale pooled connections.
+        """
+        if not keepdb:
+            from .base import close_pooled_connections
+
+            # The SQLite backend deletes the old file; connections to it,
+            # open or idle in the pool, would keep pointing at the old file
+            self.connection.close()
+            close_pooled_connections()
+        return super()._create_test_db(verbosity, autoclobber, keepdb)
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        from .base import close_pooled_connections
+
+        # Cloning replaces the target file, see _create_test_db()
+        close_pooled_connections()
+        super()._clone_test_db(suffix, verbosity, keepdb)
+
     def _destroy_test_db(self, test_database_name, verbosity):
         """
         Destroy the test database. For Turso URLs, clean up test data only.
@@ -81,6 +101,11 @@ class DatabaseCreation(SQLiteDatabaseCreation):
             # Tables will be cleaned/recreated in create_test_db if needed
             return
 
+        from .base import close_pooled_connections
+
+        # Pooled connections would keep pointing at the deleted file
+        close_pooled_connections()
+
         # Otherwise use default SQLite behavior
         super()._destroy_test_db(test_database_name, verbosity)
 
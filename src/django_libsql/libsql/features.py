@@ -33,6 +33,11 @@ class DatabaseFeatures(SQLiteFeatures):
     # Force Django to close connections between requests/threads
     # This is crucial for libSQL which isn't thread-safe
     connection_persists_old_columns = False
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        # Embedded replica mode is fixed by the settings, so resolve it once
+        self._is_embedded = connection.settings_dict.get('SYNC_URL') is not None
     
     @cached_property
     def can_return_columns_from_insert(self):
@@ -46,9 +51,7 @@ class DatabaseFeatures(SQLiteFeatures):
         For non-embedded mode, we inherit Django's SQLite implementation which
         checks for SQLite >= 3.35 (when RETURNING was introduced).
         """
-        # Check if we're in embedded replica mode
-        is_embedded = self.connection.settings_dict.get('SYNC_URL') is not None
-        if is_embedded:
+        if self._is_embedded:
             # Disable RETURNING for embedded replicas due to write/read split
             return False
         
@@ -63,6 +66,6 @@ class DatabaseFeatures(SQLiteFeatures):
         
         Same reason as can_return_columns_from_insert.
         """
-        # Just return the same value as can_return_columns_from_insert
-        # This matches what SQLite does with its property
-        return self.can_return_columns_from_insert
+        if self._is_embedded:
+            return False
+        return super().can_return_rows_from_bulk_insert
@@ -2,7 +2,10 @@
 Database operations for libSQL backend.
 """
 
+from functools import lru_cache
+
 from django.db.backends.sqlite3 import operations as sqlite_operations
+from django.utils.functional import cached_property
 
 
 class DatabaseOperations(sqlite_operations.DatabaseOperations):
@@ -23,6 +26,34 @@ class DatabaseOperations(sqlite_operations.DatabaseOperations):
         """
         # For libSQL, we don't try to execute additional queries for formatting
         # This avoids "stream not found" errors in multi-threaded scenarios
-        if params:
-            return f"{sql} -- params: {params}"
-        return sql
+        if not params:
+            return sql
+        return "%s -- params: %r" % (sql, params)
+
+    def _table_references(self, table_name):
+        """
+        Return table_name and every table that references it, recursively.
+
+        SQLite's version matches the CREATE TABLE sql with REGEXP, which
+        libSQL doesn't provide; read the declared foreign keys instead.
+        """
+        query = """
+        WITH RECURSIVE tables(name) AS (
+            SELECT %s
+            UNION
+            SELECT m.name
+            FROM sqlite_master AS m
+            JOIN pragma_foreign_key_list(m.name) AS fk
+            JOIN tables ON fk."table" = tables.name
+            WHERE m.type = 'table'
+        ) SELECT name FROM tables
+        """
+        with self.connection.cursor() as cursor:
+            cursor.execute(query, (table_name,))
+            return [row[0] for row in cursor.fetchall()]
+
+    @cached_property
+    def _references_graph(self):
+        # Used by sql_flush(allow_cascade=True), e.g. TransactionTestCase
+        # teardown with available_apps set
+        return lru_cache(maxsize=512)(self._table_references)
@@ -2,6 +2,7 @@
 Custom schema editor for libSQL to ensure migrations commit properly.
 """
 
+from django.db.backends.base.schema import logger
 from django.db.backends.sqlite3.schema import DatabaseSchemaEditor as SQLiteSchemaEditor
 
 
@@ -10,20 +11,47 @@ class DatabaseSchemaEditor(SQLiteSchemaEditor):
     Custom schema editor that ensures changes are committed to Turso.
     """
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Override atomic_migration to False for Turso
-        # Turso doesn't support nested transactions well, and we need
-        # to ensure DDL statements are committed immediately.
-        self._atomic_migration = False
-    
-    @property
-    def atomic_migration(self):
-        """Disable atomic migrations for Turso."""
-        return self._atomic_migration
-    
-    @atomic_migration.setter
-    def atomic_migration(self, value):
-        """Always keep atomic_migration False for Turso."""
-        self._atomic_migration = False
+    # Turso doesn't support nested transactions well, and we need to ensure
+    # DDL statements are committed immediately, so migrations never run
+    # inside an atomic block. A plain attribute keeps reads cheap.
+    atomic_migration = False
+
+    def __setattr__(self, name, value):
+        # Django's __init__ (and callers) may try to turn atomic_migration on
+        if name == "atomic_migration":
+            value = False
+        super().__setattr__(name, value)
+
+    def __enter__(self):
+        editor = super().__enter__()
+        # Buffer DDL on the connection so it is sent to Turso in one script.
+        # The connection flushes the buffer before any other cursor use, so
+        # introspection and RunPython still see the schema as executed.
+        if not self.collect_sql:
+            self.connection.pending_ddl = []
+        return editor
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # The buffer is always flushed, also when the migration raised:
+        # SQLiteSchemaEditor.__exit__() goes through check_constraints() and
+        # enable_constraint_checking(), which both flush it. Migrations are
+        # never atomic here, so that matches running each statement as it
+        # came: everything queued before the error is applied.
+        try:
+            super().__exit__(exc_type, exc_value, traceback)
+        finally:
+            self.connection.pending_ddl = None
 
+    def execute(self, sql, params=()):
+        """Buffer parameterless DDL; anything with parameters runs immediately."""
+        if self.collect_sql or params or self.connection.pending_ddl is None:
+            return super().execute(sql, params)
+        sql = str(sql)
+        logger.debug(
+            "%s; (params %r)", sql, params, extra={"params": params, "sql": sql}
+        )
+        # The cursor would unescape %% for an empty params sequence; a script
+        # is sent verbatim, so do the same here
+        if params is not None:
+            sql = sql.replace("%%", "%")
+        self.connection.pending_ddl.append(sql)
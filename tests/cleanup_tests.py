@@ -4,8 +4,12 @@ Cleanup script for test databases.
 import os
 import sys
 import libsql
+from graphlib import CycleError, TopologicalSorter
 from pathlib import Path
 
+# URL schemes of remote Turso/libSQL databases
+_REMOTE_SCHEMES = ('libsql://', 'wss://', 'https://')
+
 
 def cleanup_test_db():
     """Clean up test database."""
@@ -13,53 +17,52 @@ def cleanup_test_db():
     url = os.environ.get('TURSO_DATABASE_URL')
     token = os.environ.get('TURSO_AUTH_TOKEN')
     
-    if url and url.startswith(('libsql://', 'wss://', 'https://')):
+    if url and url.startswith(_REMOTE_SCHEMES):
         print("🧹 Cleaning remote database...")
         try:
             conn = libsql.connect(url, auth_token=token)
             cursor = conn.cursor()
+            try:
+                # Get all tables with the tables their foreign keys reference,
+                # read in one query via the pragma_foreign_key_list() table function
+                cursor.execute(
+                    """
+                    SELECT m.name, fk."table"
+                    FROM sqlite_master AS m
+                    LEFT JOIN pragma_foreign_key_list(m.name) AS fk
+                    WHERE m.type='table' AND m.name NOT LIKE 'sqlite_%'
+                    """
+                )
             
-            # Disable foreign key constraints
-            cursor.execute("PRAGMA foreign_keys = OFF")
-            
-            # Get all tables
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
-            all_tables = [t[0] for t in cursor.fetchall()]
-            
-            # Build dependency order for tables
-            # Django's tables have specific dependencies:
-            # 1. Drop review/related tables first (they have FKs)
-            # 2. Drop main model tables (book, testmodel)
-            # 3. Drop auth/permission tables (they have complex relationships)
-            # 4. Drop django system tables last
-            
-            # Define the order explicitly for Django tables
-            drop_order = []
-            system_tables = []
-            app_tables = []
+                # Drop referencing tables before the tables they point at, using
+                # the real foreign keys rather than guessing from Django table names
+                sorter = TopologicalSorter()
+                tables = set()
+                for table, referenced in cursor.fetchall():
+                    tables.add(table)
+                    sorter.add(table)
+                    if referenced and referenced != table:
+                        sorter.add(referenced, table)
+                try:
+                    ordered_tables = list(sorter.static_order())
+                except CycleError:
+                    # Foreign keys are off while dropping, so any order works
+                    ordered_tables = sorted(tables)
             
-            for table in all_tables:
-                if table.startswith('testapp_review') or table.startswith('testapp_related'):
-                    drop_order.insert(0, table)  # Drop first - has FKs to other tables
-                elif table.startswith('testapp_'):
-                    app_tables.append(table)
-                elif table.startswith('auth_') or table.startswith('django_'):
-                    system_tables.append(table)
-                else:
-                    drop_order.append(table)
-            
-            # Final order: app tables with FKs, other app tables, then system tables
-            ordered_tables = drop_order + app_tables + system_tables
-            
-            # Drop ALL tables including django_migrations to force migrations to re-run
-            for table in ordered_tables:
-                cursor.execute(f"DROP TABLE IF EXISTS {table}")
-                print(f"  ✓ Dropped table: {table}")
-            
-            # Re-enable foreign key constraints
-            cursor.execute("PRAGMA foreign_keys = ON")
+                # Drop ALL tables including django_migrations to force migrations to re-run,
+                # as one script (a single round trip) with foreign key constraints disabled
+                drops = "".join(f'DROP TABLE IF EXISTS "{table}";\n' for table in ordered_tables)
+                cursor.executescript(
+                    f"PRAGMA foreign_keys = OFF;\n{drops}PRAGMA foreign_keys = ON;"
+                )
+            finally:
+                # Release the stream right away rather than at conn.close()
+                cursor.close()
             conn.commit()
             conn.close()
+            # One write for the whole report instead of a print() per table
+            if ordered_tables:
+                print("\n".join(f"  ✓ Dropped table: {table}" for table in ordered_tables))
             
             print("✓ Database cleanup complete!")
         except Exception as e:
@@ -67,21 +70,12 @@ def cleanup_test_db():
             # Re-raise the exception to fail loudly - NO EXCEPTION SWALLOWING!
             raise
     
-    # Also remove local test database files
+    # Also remove local test database files, including the per-worker
+    # test_replica_<worker>.db* files of pytest-xdist runs
     test_dir = Path(__file__).parent
-    test_db_files = [
-        'test_replica.db',
-        'test_replica.db-shm',
-        'test_replica.db-wal',
-        'test_replica.db.meta',
-        'test_replica.db-info'
-    ]
-    
-    for db_file in test_db_files:
-        db_path = test_dir / db_file
-        if db_path.exists():
-            print(f"Removing {db_file}...")
-            db_path.unlink()
+    for db_path in sorted(test_dir.glob('test_replica*.db*')):
+        print(f"Removing {db_path.name}...")
+        db_path.unlink()
 
 
 if __name__ == "__main__":
@@ -16,6 +16,17 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
 # Setup Django
 django.setup()
 
+from django.db import connection as _connection
+
+# URL schemes of remote Turso/libSQL databases
+_REMOTE_SCHEMES = ('libsql://', 'wss://', 'https://')
+
+# Only embedded replicas (a local file with SYNC_URL) can sync; every
+# DatabaseWrapper of this backend has a sync() method, so check the settings
+_SUPPORTS_SYNC = callable(getattr(_connection, "sync", None)) and bool(
+    _connection.settings_dict.get("SYNC_URL")
+)
+
 # Import Django's pytest plugin to use its database setup
 import pytest
 from pytest_django.plugin import _setup_django
@@ -25,33 +36,19 @@ from pytest_django.plugin import _setup_django
 @pytest.fixture(scope="session")
 def django_db_setup(django_db_blocker):
     """Override django_db_setup to ensure migrations are run."""
-    from django.core.management import call_command
+    from django.conf import settings
     from django.db import connection
-    import os
 
     with django_db_blocker.unblock():
         # For embedded replica mode, we need to ensure tables exist
-        is_embedded = os.environ.get('USE_EMBEDDED_REPLICA', 'False').lower() in ('true', '1', 'yes')
-        
-        # Always create migrations first
-        call_command("makemigrations", "testapp", verbosity=0, interactive=False)
+        is_embedded = settings.USE_EMBEDDED_REPLICA
         
-        # Check if tables already exist to avoid "table already exists" error
         connection.ensure_connection()
         
-        # Try to check if migrations table exists
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='django_migrations'")
-                has_migrations_table = cursor.fetchone() is not None
-        except Exception as e:
-            # If we can't check, assume no tables
-            has_migrations_table = False
-        
         # For embedded replica, we need special handling for migrations
         if is_embedded:
             # First, try to sync any existing tables from remote
-            if hasattr(connection, "sync"):
+            if _SUPPORTS_SYNC:
                 try:
                     connection.sync()
                 except Exception as e:
@@ -61,10 +58,10 @@ def django_db_setup(django_db_blocker):
             
             # Always use normal migrate for embedded replica too
             # The --run-syncdb flag causes issues with Django's built-in migrations
-            call_command("migrate", verbosity=1, interactive=False)
+            _migrate_if_needed(connection)
             
             # After migrations, sync again to ensure LOCAL has all the tables
-            if hasattr(connection, "sync"):
+            if _SUPPORTS_SYNC:
                 try:
                     connection.sync()
                     connection.commit()
@@ -73,27 +70,74 @@ def django_db_setup(django_db_blocker):
         else:
             # For remote-only mode, always use normal migrate
             # Django will handle creating tables if they don't exist
-            call_command("migrate", verbosity=1, interactive=False)
+            _migrate_if_needed(connection)
+
+
+def _migrate_if_needed(connection):
+    """
+    Create testapp migrations and migrate, skipping whichever is up to date.
+
+    One loaded migration graph answers both questions, so the common "nothing
+    to do" run never goes through the makemigrations/migrate commands.
+    """
+    from django.apps import apps
+    from django.core.management import call_command
+    from django.db.migrations.autodetector import MigrationAutodetector
+    from django.db.migrations.executor import MigrationExecutor
+    from django.db.migrations.state import ProjectState
+
+    executor = MigrationExecutor(connection)
+    autodetector = MigrationAutodetector(
+        executor.loader.project_state(), ProjectState.from_apps(apps)
+    )
+    if autodetector.changes(graph=executor.loader.graph, trim_to_apps={"testapp"}):
+        call_command("makemigrations", "testapp", verbosity=0, interactive=False)
+        # Pick up the migration files just written
+        executor = MigrationExecutor(connection)
+
+    targets = executor.loader.graph.leaf_nodes()
+    if executor.migration_plan(targets):
+        # migrate also sends the pre/post_migrate signals the apps rely on
+        call_command("migrate", verbosity=1, interactive=False)
 
 
 @pytest.fixture(autouse=True)
-def reset_test_data(db):
+def reset_test_data(request):
     """Reset test data before each test to ensure isolation."""
+    from django.test import SimpleTestCase, TransactionTestCase
     from tests.testapp.models import Book, Review, TestModel, RelatedModel
-    from django.db import connection, transaction
+    from django.db import connection
 
-    # Clear all data before each test
+    # SimpleTestCase tests must not touch the database at all
+    if (
+        request.cls is not None
+        and issubclass(request.cls, SimpleTestCase)
+        and not issubclass(request.cls, TransactionTestCase)
+    ):
+        return
+    request.getfixturevalue("db")
+
+    # Clear all data before each test with one script (a single round trip)
+    # instead of an ORM delete() per model
+    tables = [
+        model._meta.db_table for model in (Review, Book, RelatedModel, TestModel)
+    ]
+    deletes = "".join(f'DELETE FROM "{table}";' for table in tables)
+    has_rows = " OR ".join(f'EXISTS (SELECT 1 FROM "{table}")' for table in tables)
     try:
-        with transaction.atomic():
-            # Delete in correct order to avoid foreign key issues
-            Review.objects.all().delete()
-            Book.objects.all().delete()
-            RelatedModel.objects.all().delete()
-            TestModel.objects.all().delete()
-        # Transaction automatically commits when exiting the atomic block
+        with connection.cursor() as cursor:
+            # Reads are served locally, so checking first is cheap; when the
+            # previous test left nothing behind there is nothing to delete
+            # or to sync
+            cursor.execute(f"SELECT {has_rows}")
+            dirty = bool(cursor.fetchall()[0][0])
+            if dirty:
+                cursor.executescript(
+                    f"PRAGMA foreign_keys = OFF;{deletes}PRAGMA foreign_keys = ON;"
+                )
         
         # Only sync for embedded replicas (not remote-only connections)
-        if hasattr(connection, "sync") and connection.settings_dict.get("SYNC_URL"):
+        if _SUPPORTS_SYNC and dirty:
             connection.sync()
     except Exception as e:
         # Only ignore if tables don't exist (first run) - all other errors should propagate
@@ -102,8 +146,13 @@ def reset_test_data(db):
         # Tables don't exist yet - this is fine, Django will create them
 
 
-def _cleanup_test_database(verbose=True):
-    """Clean up test artifacts from the database."""
+def _cleanup_test_database(verbose=True, conn=None):
+    """
+    Clean up test artifacts from the database.
+
+    Pass an open libsql connection as ``conn`` to reuse it across calls (for
+    example before and after a session); the caller then closes it.
+    """
     import libsql
     from django.conf import settings
     
@@ -111,33 +160,46 @@ def _cleanup_test_database(verbose=True):
     url = db_settings.get('NAME') or db_settings.get('SYNC_URL')
     token = db_settings.get('AUTH_TOKEN')
     
-    if not url or not url.startswith(('libsql://', 'wss://', 'https://')):
+    if not url or not url.startswith(_REMOTE_SCHEMES):
         return
     
     if verbose:
         print("\n🧹 Cleaning test database...")
     
+    owns_conn = conn is None
     try:
-        conn = libsql.connect(url, auth_token=token)
+        if owns_conn:
+            conn = libsql.connect(url, auth_token=token)
         cursor = conn.cursor()
+        try:
+            # Have SQLite build the DROP statements for all tables except its
+            # internal ones, so only one row crosses the wire
+            cursor.execute(
+                """
+                SELECT count(*),
+                       group_concat(
+                           'DROP TABLE IF EXISTS "' || replace(name, '"', '""') || '";',
+                           char(10)
+                       )
+                FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'
+                """
+            )
+            # fetchall() finalizes the statement; with fetchone() the DROPs
+            # below fail with "database table is locked"
+            tables_dropped, drops = cursor.fetchall()[0]
         
-        # Disable foreign key constraints
-        cursor.execute("PRAGMA foreign_keys = OFF")
-        
-        # Get all tables except SQLite internal tables
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
-        all_tables = [t[0] for t in cursor.fetchall()]
-        
-        # Drop ALL tables for complete cleanup
-        tables_dropped = 0
-        for table in all_tables:
-            cursor.execute(f"DROP TABLE IF EXISTS {table}")
-            tables_dropped += 1
-        
-        # Re-enable foreign key constraints
-        cursor.execute("PRAGMA foreign_keys = ON")
+            # Drop ALL tables for complete cleanup, in a single round trip with
+            # foreign key constraints disabled
+            if tables_dropped:
+                cursor.executescript(
+                    f"PRAGMA foreign_keys = OFF;\n{drops}\nPRAGMA foreign_keys = ON;"
+                )
+        finally:
+            # Release the stream right away rather than at conn.close()
+            cursor.close()
         conn.commit()
-        conn.close()
+        if owns_conn:
+            conn.close()
         
         if verbose:
             print(f"✓ Dropped {tables_dropped} tables")
@@ -153,30 +215,34 @@ def _cleanup_test_database(verbose=True):
 @pytest.fixture(scope="session", autouse=True)
 def cleanup_database_before_and_after_tests(request):
     """Clean up all test artifacts BEFORE and AFTER the entire test session."""
-    import os
-    from pathlib import Path
+    from django.conf import settings
     
     # For embedded replica mode, ALWAYS clean up local files BEFORE tests
-    # This ensures we start fresh with an empty local replica
-    base_dir = Path(__file__).resolve().parent
+    # This ensures we start fresh with an empty local replica (this worker's
+    # own file when running under pytest-xdist)
+    replica = settings.TEST_REPLICA_PATH
     replica_files = [
-        base_dir / "test_replica.db",
-        base_dir / "test_replica.db-wal",
-        base_dir / "test_replica.db-shm",
-        base_dir / "test_replica.db-info"
+        replica,
+        replica.with_name(f"{replica.name}-wal"),
+        replica.with_name(f"{replica.name}-shm"),
+        replica.with_name(f"{replica.name}-info"),
     ]
+    from django_libsql.libsql.base import close_pooled_connections
+
+    # A pooled connection would outlive the replica file removed below
+    close_pooled_connections()
     for f in replica_files:
-        if f.exists():
-            f.unlink()
+        f.unlink(missing_ok=True)
     
     # DON'T clean remote database here - it's cleaned by Makefile between modes
     # _cleanup_test_database()  # REMOVED - handled by Makefile
     
     # Register cleanup to run AFTER all tests
     def final_cleanup():
+        # Idle pooled connections still hold the replica file open
+        close_pooled_connections()
         # Only clean up local files, not remote
         for f in replica_files:
-            if f.exists():
-                f.unlink()
+            f.unlink(missing_ok=True)
     
     request.addfinalizer(final_cleanup)
@@ -8,6 +8,15 @@ import sys
 import pytest
 
 
+# The GIL state is fixed for the life of the process, so read it once
+try:
+    import _thread
+
+    _GIL_DISABLED = not _thread._is_gil_enabled()
+except (ImportError, AttributeError):
+    _GIL_DISABLED = os.environ.get("PYTHON_GIL", "1") == "0"
+
+
 def pytest_configure(config):
     """Add custom markers for GIL testing."""
     config.addinivalue_line(
@@ -20,12 +29,7 @@ def pytest_configure(config):
 
 def pytest_collection_modifyitems(config, items):
     """Automatically skip tests based on GIL status."""
-    try:
-        import _thread
-
-        gil_disabled = not _thread._is_gil_enabled()
-    except (ImportError, AttributeError):
-        gil_disabled = os.environ.get("PYTHON_GIL", "1") == "0"
+    gil_disabled = _GIL_DISABLED
 
     skip_no_gil = pytest.mark.skip(reason="Test requires GIL to be disabled")
 
@@ -37,12 +41,7 @@ def pytest_collection_modifyitems(config, items):
 @pytest.fixture(scope="session")
 def gil_status():
     """Fixture that provides current GIL status."""
-    try:
-        import _thread
-
-        return "DISABLED" if not _thread._is_gil_enabled() else "ENABLED"
-    except (ImportError, AttributeError):
-        return "DISABLED" if os.environ.get("PYTHON_GIL", "1") == "0" else "ENABLED"
+    return "DISABLED" if _GIL_DISABLED else "ENABLED"
 
 
 @pytest.fixture
@@ -8,7 +8,7 @@ from decimal import Decimal
 from datetime import date
 
 from django.core.management.base import BaseCommand
-from django.db import connections
+from django.db import connection, connections
 from tests.testapp.models import Book
 
 
@@ -27,17 +27,26 @@ class Command(BaseCommand):
             # Django handles per-thread connections automatically
 
             try:
-                for i in range(3):
-                    book = Book.objects.create(
-                        title=f"Thread_{worker_id}_Book_{i}",
-                        author=f"Author_{worker_id}",
-                        isbn=f"978-{worker_id:02d}-{i:02d}-00000-0",
-                        published_date=date(2024, 1, 1),
-                        pages=100 + i,
-                        price=Decimal("29.99"),
-                        in_stock=True,
+                # One multi-row INSERT per worker instead of one per book
+                books = Book.objects.bulk_create(
+                    [
+                        Book(
+                            title=f"Thread_{worker_id}_Book_{i}",
+                            author=f"Author_{worker_id}",
+                            isbn=f"978-{worker_id:02d}-{i:02d}-00000-0",
+                            published_date=date(2024, 1, 1),
+                            pages=100 + i,
+                            price=Decimal("29.99"),
+                            in_stock=True,
+                        )
+                        for i in range(3)
+                    ]
+                )
+                for book in books:
+                    # Embedded replicas can't return ids from a bulk insert
+                    self.stdout.write(
+                        f"  Worker {worker_id}: Created book {book.id or book.title}"
                     )
-                    self.stdout.write(f"  Worker {worker_id}: Created book {book.id}")
                 return True
             except Exception as e:
                 self.stdout.write(f"  Worker {worker_id} ERROR: {e}")
@@ -49,7 +58,10 @@ class Command(BaseCommand):
             results = [f.result() for f in futures]
 
         successful = sum(1 for r in results if r)
-        total_books = Book.objects.count()
+        # Plain COUNT(*) so the check measures libSQL, not queryset building
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM "{Book._meta.db_table}"')
+            total_books = cursor.fetchone()[0]
 
         self.stdout.write(f"\nResults:")
         self.stdout.write(f"  Successful workers: {successful}/4")
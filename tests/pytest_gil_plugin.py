@@ -11,6 +11,15 @@ import subprocess
 import pytest
 
 
+# The GIL state is fixed for the life of the process, so read it once
+try:
+    import _thread
+
+    _GIL_DISABLED = not _thread._is_gil_enabled()
+except (ImportError, AttributeError):
+    _GIL_DISABLED = os.environ.get("PYTHON_GIL", "1") == "0"
+
+
 def pytest_addoption(parser):
     """Add command-line options for GIL testing."""
     parser.addoption(
@@ -47,12 +56,7 @@ def pytest_collection_modifyitems(config, items):
     test_both = config.getoption("--test-gil-modes")
 
     # Check current GIL status
-    try:
-        import _thread
-
-        gil_is_disabled = not _thread._is_gil_enabled()
-    except (ImportError, AttributeError):
-        gil_is_disabled = os.environ.get("PYTHON_GIL", "1") == "0"
+    gil_is_disabled = _GIL_DISABLED
 
     # Create skip markers
     skip_gil_disabled = pytest.mark.skip(reason="Test requires GIL to be disabled")
@@ -86,38 +90,21 @@ def pytest_runtest_setup(item):
 @pytest.fixture
 def ensure_gil_disabled():
     """Fixture that ensures GIL is disabled for a test."""
-    try:
-        import _thread
-
-        if _thread._is_gil_enabled():
-            pytest.skip("Test requires GIL to be disabled")
-    except (ImportError, AttributeError):
-        if os.environ.get("PYTHON_GIL", "1") != "0":
-            pytest.skip("Test requires PYTHON_GIL=0")
+    if not _GIL_DISABLED:
+        pytest.skip("Test requires GIL to be disabled")
 
 
 @pytest.fixture
 def ensure_gil_enabled():
     """Fixture that ensures GIL is enabled for a test."""
-    try:
-        import _thread
-
-        if not _thread._is_gil_enabled():
-            pytest.skip("Test requires GIL to be enabled")
-    except (ImportError, AttributeError):
-        if os.environ.get("PYTHON_GIL", "1") == "0":
-            pytest.skip("Test requires GIL to be enabled")
+    if _GIL_DISABLED:
+        pytest.skip("Test requires GIL to be enabled")
 
 
 @pytest.fixture
 def gil_status():
     """Fixture that provides current GIL status."""
-    try:
-        import _thread
-
-        return "DISABLED" if not _thread._is_gil_enabled() else "ENABLED"
-    except (ImportError, AttributeError):
-        return "DISABLED" if os.environ.get("PYTHON_GIL", "1") == "0" else "ENABLED"
+    return "DISABLED" if _GIL_DISABLED else "ENABLED"
 
 
 class GILTestRunner:
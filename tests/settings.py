@@ -7,44 +7,53 @@ SECRET_KEY = "test-secret-key"
 # Base directory for test database files
 BASE_DIR = Path(__file__).resolve().parent
 
-# Control whether to use embedded replica mode via environment variable
-USE_EMBEDDED_REPLICA = os.environ.get('USE_EMBEDDED_REPLICA', 'False').lower() in ('true', '1', 'yes')
+# Local replica file; each pytest-xdist worker (pytest -n) gets its own
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+TEST_REPLICA_PATH = BASE_DIR / (
+    f"test_replica_{_XDIST_WORKER}.db" if _XDIST_WORKER else "test_replica.db"
+)
+
+# Control whether to use embedded replica mode via environment variable.
+# Defaults to embedded replica so queries hit a local file instead of paying a
+# Turso round trip each; set USE_EMBEDDED_REPLICA=false for remote-only mode
+USE_EMBEDDED_REPLICA = os.environ.get('USE_EMBEDDED_REPLICA', 'True').lower() in ('true', '1', 'yes')
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django_libsql.libsql",
+        "AUTH_TOKEN": os.environ.get("TURSO_AUTH_TOKEN"),
+        "SYNC_INTERVAL": float(os.environ.get("TURSO_SYNC_INTERVAL", "0.1")),
+        # Keep each thread's connection (and its Turso stream) open for the
+        # whole test run, re-checking it before reuse in case the stream
+        # expired
+        "CONN_MAX_AGE": None,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "init_command": ("PRAGMA foreign_keys=ON; PRAGMA busy_timeout=5000;"),
+        },
+        "TEST": {
+            "MIGRATE": True,
+        },
+    }
+}
 
 if USE_EMBEDDED_REPLICA:
     # Embedded replica mode - local file with remote sync
-    DATABASES = {
-        "default": {
-            "ENGINE": "django_libsql.libsql",
-            "NAME": str(BASE_DIR / "test_replica.db"),  # Local file
+    DATABASES["default"].update(
+        {
+            "NAME": str(TEST_REPLICA_PATH),  # Local file
             "SYNC_URL": os.environ.get("TURSO_DATABASE_URL"),
-            "AUTH_TOKEN": os.environ.get("TURSO_AUTH_TOKEN"),
-            "SYNC_INTERVAL": float(os.environ.get("TURSO_SYNC_INTERVAL", "0.1")),
-            "OPTIONS": {
-                "init_command": ("PRAGMA foreign_keys=ON; PRAGMA busy_timeout=5000;"),
-            },
-            "TEST": {
-                "NAME": str(BASE_DIR / "test_replica.db"),
-                "MIGRATE": True,
-            },
+            # Tests sync explicitly after writes, so background sync only
+            # needs to run occasionally
+            "SYNC_INTERVAL": float(os.environ.get("TURSO_SYNC_INTERVAL", "5.0")),
         }
-    }
+    )
 else:
-    # Remote-only mode - direct Turso connection
-    DATABASES = {
-        "default": {
-            "ENGINE": "django_libsql.libsql",
-            "NAME": os.environ.get("TURSO_DATABASE_URL"),
-            "AUTH_TOKEN": os.environ.get("TURSO_AUTH_TOKEN"),
-            "SYNC_INTERVAL": float(os.environ.get("TURSO_SYNC_INTERVAL", "0.1")),
-            "OPTIONS": {
-                "init_command": ("PRAGMA foreign_keys=ON; PRAGMA busy_timeout=5000;"),
-            },
-            "TEST": {
-                "NAME": os.environ.get("TURSO_DATABASE_URL"),
-                "MIGRATE": True,
-            },
-        }
-    }
+    # Remote-only mode - direct Turso connection, or an in-memory database
+    # when no Turso URL is configured
+    DATABASES["default"]["NAME"] = os.environ.get("TURSO_DATABASE_URL") or ":memory:"
+
+DATABASES["default"]["TEST"]["NAME"] = DATABASES["default"]["NAME"]
 
 INSTALLED_APPS = [
     "django.contrib.contenttypes",
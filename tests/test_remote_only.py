@@ -9,19 +9,23 @@ import pytest
 from django.db import connection
 from django.test import TransactionTestCase
 
+from django_libsql.libsql.base import REMOTE_URL_SCHEMES
 from tests.testapp.models import Book, Review
 
 
 def is_remote_only():
-    """Check if we're using remote-only mode."""
+    """Check if we're using remote-only mode (NAME is a remote URL)."""
     from django.conf import settings
-    return not bool(settings.DATABASES['default'].get('SYNC_URL'))
+    return str(settings.DATABASES['default']['NAME']).startswith(REMOTE_URL_SCHEMES)
 
 
 # Decorator to skip tests when not in remote-only mode
 requires_remote_only = pytest.mark.skipif(
     not is_remote_only(),
-    reason="This test requires remote-only mode (set USE_EMBEDDED_REPLICA=false)"
+    reason=(
+        "This test requires remote-only mode (set USE_EMBEDDED_REPLICA=false "
+        "and TURSO_DATABASE_URL)"
+    )
 )
 
 
@@ -38,7 +38,10 @@ def is_embedded_replica():
 # Decorator to skip tests that require embedded replicas
 requires_embedded_replica = pytest.mark.skipif(
     not is_embedded_replica(),
-    reason="This test requires embedded replica mode (set USE_EMBEDDED_REPLICA=true)"
+    reason=(
+        "This test requires an embedded replica with a sync URL "
+        "(set TURSO_DATABASE_URL and keep USE_EMBEDDED_REPLICA unset or true)"
+    )
 )
 
 